@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import settings
@@ -53,6 +54,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (e.g. /llm/functions pages) for clients that
+# send Accept-Encoding: gzip, as httpx does by default.  A mid-range level
+# keeps server CPU low on multi-MB JSON bodies.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -19,7 +19,8 @@ from __future__ import annotations
 import logging
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
@@ -41,6 +42,7 @@ from data.loader import (
     load_ghidra_cfg,
     load_ghidra_variables,
 )
+from data import paths
 from data.paths import discover_test_cases
 
 log = logging.getLogger(__name__)
@@ -54,6 +56,56 @@ SYNTHETIC_ROOT = Path(settings.ARTIFACTS_PATH) / "synthetic"
 _DATASET_ARCH = "x86-64"
 
 
+# ─── Joined-row cache ────────────────────────────────────────────────────────
+# The runner pages through /functions; without a cache every page would
+# reload and re-join every test case.  Each listing is stored with the
+# mtimes of the files it was built from and rebuilt when they change.
+
+_LISTING_CACHE_SIZE = 8
+_listing_cache: Dict[Tuple[Any, ...], Tuple[Tuple[int, ...], List[Dict[str, Any]]]] = {}
+_listing_lock = Lock()
+
+
+def _source_stamp(test_cases: List[str], opt: str, variant: str) -> Tuple[int, ...]:
+    """mtimes of the joined + decompiled JSONL files behind a listing."""
+    stamp: List[int] = []
+    for tc in test_cases:
+        for path in (
+            paths.joined_functions_path(SYNTHETIC_ROOT, tc, opt, variant),
+            paths.ghidra_functions_path(SYNTHETIC_ROOT, tc, opt, variant),
+        ):
+            try:
+                stamp.append(path.stat().st_mtime_ns)
+            except OSError:
+                stamp.append(-1)
+    return tuple(stamp)
+
+
+def _load_listing(
+    test_cases: List[str], opt: str, variant: str, tier: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Joined rows for *test_cases*, loaded once per artefact version."""
+    key = (tuple(test_cases), opt, variant, tier)
+    stamp = _source_stamp(test_cases, opt, variant)
+    with _listing_lock:
+        cached = _listing_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    rows: List[Dict[str, Any]] = []
+    for tc in test_cases:
+        rows.extend(load_functions_with_decompiled(
+            tc, opt, variant, tier=tier, artifacts_root=SYNTHETIC_ROOT,
+        ))
+
+    with _listing_lock:
+        _listing_cache.pop(key, None)
+        _listing_cache[key] = (stamp, rows)
+        while len(_listing_cache) > _LISTING_CACHE_SIZE:
+            del _listing_cache[next(iter(_listing_cache))]
+    return rows
+
+
 # ─── Context level enum ──────────────────────────────────────────────────────
 
 class ContextLevel(str, Enum):
@@ -144,17 +196,9 @@ async def list_llm_functions(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Artifacts root not found: {SYNTHETIC_ROOT}",
             )
-        raw_rows: list = []
-        for tc in all_tc:
-            rows = load_functions_with_decompiled(
-                tc, opt, variant, tier=tier, artifacts_root=SYNTHETIC_ROOT,
-            )
-            raw_rows.extend(rows)
     else:
         all_tc = [test_case]
-        raw_rows = load_functions_with_decompiled(
-            test_case, opt, variant, tier=tier, artifacts_root=SYNTHETIC_ROOT,
-        )
+    raw_rows = _load_listing(all_tc, opt, variant, tier)
 
     # Audit: log how many forbidden keys exist in the raw data (metric)
     if raw_rows:
@@ -5,14 +5,18 @@ Includes job_id-based idempotency and run registry.
 """
 from __future__ import annotations
 
+import gzip
 import json
 import logging
+import re
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import Lock
 from typing import Any, Dict, List, Optional, Set
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.routing import APIRoute
 from pydantic import BaseModel, Field
 
 from app.config import settings
@@ -24,7 +28,42 @@ from data.scoring import score_experiment
 
 log = logging.getLogger(__name__)
 
-router = APIRouter()
+
+class _GzipRequest(Request):
+    """Request whose body is transparently gunzipped (``Content-Encoding: gzip``)."""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.getlist("Content-Encoding"):
+                try:
+                    body = gzip.decompress(body)
+                except (OSError, EOFError, zlib.error):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="invalid gzip body",
+                    )
+            self._body = body
+        return self._body
+
+
+class _GzipRoute(APIRoute):
+    """Route class that accepts gzip-compressed request bodies.
+
+    The LLM runner compresses large ``/results/batch`` payloads (the
+    ``prompt_text`` column compresses 5-10x).
+    """
+
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def gzip_route_handler(request: Request):
+            return await original_handler(_GzipRequest(request.scope, request.receive))
+
+        return gzip_route_handler
+
+
+router = APIRouter(route_class=_GzipRoute)
 
 # Results live alongside artifacts:  <ARTIFACTS_PATH>/results/llm/<experiment_id>/results.jsonl
 RESULTS_ROOT = Path(settings.ARTIFACTS_PATH) / "results" / "llm"
@@ -501,6 +540,9 @@ def _build_stable_key_lookup(
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
 @router.post(
     "/{experiment_id}/repair",
     summary="Repair top-k results: parse response_text into predictions",
@@ -514,6 +556,9 @@ async def repair_results(experiment_id: str):
     Fix: re-parse ``response_text`` with parse_topk_response, update
     ``predicted_name`` to the top-1 candidate, and store predictions in metadata.
     Then overwrites ``results.jsonl`` with the repaired rows.
+
+    Rows whose ``predicted_name`` is already a clean identifier, and rows
+    whose ``response_text`` was truncated by the runner, are left as-is.
     """
     from workers.llm.response_parser import parse_topk_response
 
@@ -530,16 +575,19 @@ async def repair_results(experiment_id: str):
 
     repaired_count = 0
     for row in rows:
-        response_text = row.get("response_text", "")
-        predicted_name = row.get("predicted_name", "")
-
-        # Only repair rows where predicted_name looks like raw JSON
-        # (starts with { or contains "predictions")
-        needs_repair = (
-            predicted_name.lstrip().startswith("{")
-            or '"predictions"' in predicted_name
-        )
-        if not needs_repair:
+        response_text = row.get("response_text") or ""
+        predicted_name = row.get("predicted_name") or ""
+        metadata = row.get("metadata")
+
+        # A truncated response_text (runner --max-response-chars) would
+        # re-parse as broken JSON
+        if isinstance(metadata, dict) and "response_truncated_from" in metadata:
+            continue
+
+        # Only repair rows whose predicted_name is not already a clean
+        # identifier (raw JSON, fenced text, ...), even if metadata
+        # already holds predictions
+        if not predicted_name or _IDENTIFIER_RE.fullmatch(predicted_name):
             continue
 
         parsed = parse_topk_response(response_text or predicted_name, k=3)
@@ -551,7 +599,6 @@ async def repair_results(experiment_id: str):
             row["predicted_name"] = predicted_name  # leave as-is if parse fails
 
         # Store predictions in metadata
-        metadata = row.get("metadata", {})
         if not isinstance(metadata, dict):
             metadata = {}
         metadata["predictions"] = parsed.predictions
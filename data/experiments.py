@@ -51,6 +51,8 @@ class ExperimentConfig(BaseModel):
     model: str = Field(..., description="OpenRouter model identifier, e.g. openai/gpt-4o-mini")
     temperature: float = Field(0.0, ge=0.0, le=2.0, description="Sampling temperature")
     max_tokens: Optional[int] = Field(default=None, description="Max tokens in response (None = model default)")
+    rpm: Optional[int] = Field(default=None, ge=1, description="OpenRouter requests-per-minute budget (None = unlimited)")
+    tpm: Optional[int] = Field(default=None, ge=1, description="OpenRouter tokens-per-minute budget (None = unlimited)")
 
     # ── Prompt Configuration ──────────────────────────────────────────────
     prompt_template_id: str = Field(..., description="Template name matching files in workers/llm/prompt_templates/")
@@ -198,7 +198,7 @@ class LLMResultRow(BaseModel):
         ...,
         description=(
             "Deterministic per-row ID for idempotency. "
-            "Typically sha256(experiment_id|run_id|dwarf_function_id|model|prompt_template_id|temperature)."
+            "Typically blake2b-64(experiment_id|run_id|dwarf_function_id|model|prompt_template_id|temperature)."
         ),
     )
     timestamp: str = Field(..., description="ISO-8601 timestamp")
@@ -216,6 +216,10 @@ class LLMResultRow(BaseModel):
 
     # Prompt & response
     prompt_text: str = Field(default="", description="Full prompt sent to the model")
+    prompt_sha256: Optional[str] = Field(
+        default=None,
+        description="SHA-256 of the prompt, set when prompt_text is not stored",
+    )
     response_text: str = Field(default="", description="Raw model response")
 
     # Telemetry
@@ -231,6 +235,13 @@ class LLMResultRow(BaseModel):
     # Freeform extras for experiment-specific data
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    @model_validator(mode="after")
+    def _default_predicted_name(self) -> "LLMResultRow":
+        # Single-name runs omit predicted_name on the wire; it is the raw response
+        if self.predicted_name is None:
+            self.predicted_name = self.response_text
+        return self
+
 
 class RunRecord(BaseModel):
     """A benchmarking run — groups multiple jobs across models/repeats."""
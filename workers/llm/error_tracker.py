@@ -0,0 +1,83 @@
+"""
+Bounded error bookkeeping for experiment runs.
+
+During a provider outage every LLM call fails, and keeping one dict per
+failure (with the full exception text) for a 5000-function run wastes
+memory and floods the run summary.  :class:`ErrorTracker` keeps a pure
+count, the first ``max_samples`` errors and the last ``last_n``, and
+reports when failures have run on long enough to stop the run early.
+
+Usage::
+
+    from workers.llm.error_tracker import ErrorTracker
+
+    errtrack = ErrorTracker(fail_after=50)
+    errtrack.record(dwarf_function_id=func_id, error=str(exc))
+    if errtrack.tripped:
+        ...  # cancel remaining work
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+MAX_SAMPLES = 100
+LAST_N = 10
+
+
+class ErrorTracker:
+    """Counts errors, keeping only a bounded sample of their details.
+
+    Parameters
+    ----------
+    max_samples : int
+        Number of leading errors kept in :attr:`samples`.
+    last_n : int
+        Number of trailing errors kept in :attr:`last`.
+    fail_after : int | None
+        Consecutive errors (with no success in between) after which
+        :attr:`tripped` becomes true.  ``None`` disables fast-fail.
+    """
+
+    def __init__(
+        self,
+        max_samples: int = MAX_SAMPLES,
+        last_n: int = LAST_N,
+        fail_after: Optional[int] = None,
+    ) -> None:
+        self.max_samples = max_samples
+        self.fail_after = fail_after
+        self.total = 0
+        self.consecutive = 0
+        self.samples: List[Dict[str, Any]] = []
+        self.last: Deque[Dict[str, Any]] = deque(maxlen=last_n)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def record(self, **detail: Any) -> None:
+        """Count one error, keeping *detail* if it falls in a sample."""
+        self.total += 1
+        self.consecutive += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(detail)
+        self.last.append(detail)
+
+    def record_success(self) -> None:
+        """Reset the consecutive-error streak."""
+        self.consecutive = 0
+
+    @property
+    def tripped(self) -> bool:
+        """True once ``fail_after`` errors have occurred back to back."""
+        return self.fail_after is not None and self.consecutive >= self.fail_after
+
+    def details(self) -> Optional[List[Dict[str, Any]]]:
+        """Kept error details (leading samples, then the trailing ones not
+        already among them), or ``None`` if there were no errors."""
+        if not self.total:
+            return None
+        dropped = self.total - len(self.samples)
+        if dropped <= 0:
+            return list(self.samples)
+        return self.samples + list(self.last)[-dropped:]
@@ -13,11 +13,22 @@ Supported placeholders:
 """
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 _TEMPLATES_DIR = Path(__file__).parent / "prompt_templates"
 
+_PLACEHOLDER_RE = re.compile(r"\{\{ (c_raw|calls|cfg_summary|variables) \}\}")
+
+# Substitutes for optional context that was not provided
+_MISSING = {
+    "calls": "(no call data available)",
+    "cfg_summary": "(no CFG data available)",
+    "variables": "(no variable data available)",
+}
+
 
 def load_template(template_id: str) -> str:
     """Load a prompt template by ID.
@@ -46,6 +57,12 @@ def load_template(template_id: str) -> str:
     return path.read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=32)
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """Split *template* into ``(text, name, text, name, ..., text)``."""
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
 def render_prompt(
     template: str,
     c_raw: str,
@@ -74,17 +91,15 @@ def render_prompt(
     str
         Fully rendered prompt ready for the LLM.
     """
-    result = template.replace("{{ c_raw }}", c_raw)
-    if calls is not None:
-        result = result.replace("{{ calls }}", calls)
-    else:
-        result = result.replace("{{ calls }}", "(no call data available)")
-    if cfg_summary is not None:
-        result = result.replace("{{ cfg_summary }}", cfg_summary)
-    else:
-        result = result.replace("{{ cfg_summary }}", "(no CFG data available)")
-    if variables is not None:
-        result = result.replace("{{ variables }}", variables)
-    else:
-        result = result.replace("{{ variables }}", "(no variable data available)")
-    return result
+    values = {
+        "c_raw": c_raw,
+        "calls": calls if calls is not None else _MISSING["calls"],
+        "cfg_summary": cfg_summary if cfg_summary is not None else _MISSING["cfg_summary"],
+        "variables": variables if variables is not None else _MISSING["variables"],
+    }
+    # The template is split once; each render is a single join, and
+    # placeholder-like text inside the substituted code is left alone.
+    parts = list(_compile_template(template))
+    for i in range(1, len(parts), 2):
+        parts[i] = values[parts[i]]
+    return "".join(parts)
@@ -0,0 +1,202 @@
+"""
+Adaptive concurrency control for OpenRouter calls.
+
+OpenRouter applies dynamic, per-key rate limits, so a fixed
+``asyncio.Semaphore(concurrency)`` is either too low (throughput left on
+the table) or too high (429 storms).  :class:`AdaptiveLimiter` starts at
+the requested concurrency and adjusts it AIMD-style:
+
+- **Additive increase** — every ``grow_every`` successful calls the limit
+  grows by one, up to ``max_limit``.
+- **Multiplicative decrease** — a throttled call (429 / 5xx) halves the
+  limit, never below one.
+
+Optional requests-per-minute (``rpm``) and tokens-per-minute (``tpm``)
+budgets are enforced with :class:`TokenBucket` credit pools, so long
+prompts slow the request rate *before* the provider starts returning 429s.
+
+Usage::
+
+    from workers.llm.rate_limit import AdaptiveLimiter, is_retryable
+
+    limiter = AdaptiveLimiter(5, max_limit=20, tpm=200_000)
+    async with limiter.slot(tokens=estimate):
+        result = await call_llm(...)
+    limiter.on_success()
+    limiter.settle(estimate, result["total_tokens"])
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+# Retry policy for throttled / transient OpenRouter failures
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5   # seconds; delay = 2**attempt * BACKOFF_BASE + jitter
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True if *exc* is a 429 or 5xx response worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return False
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header on *exc*, if any."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        value = exc.response.headers.get("Retry-After")
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None  # HTTP-date form — fall back to back-off
+    return None
+
+
+def backoff_delay(attempt: int, exc: Optional[BaseException] = None) -> float:
+    """Delay before retry *attempt*: ``Retry-After`` if the provider sent
+    one, else exponential back-off with up to one second of jitter."""
+    if exc is not None:
+        requested = retry_after(exc)
+        if requested is not None:
+            return requested
+    return 2 ** attempt * BACKOFF_BASE + random.random()
+
+
+def estimate_tokens(prompt_text: str, max_tokens: Optional[int] = None) -> int:
+    """Rough token cost of a call: ~4 chars per prompt token + completion cap."""
+    return len(prompt_text) // 4 + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Credit pool of *per_minute* units, refilled continuously.
+
+    Waiters are served in FIFO order.  A single request larger than the
+    whole bucket is clamped to the bucket size so it can still proceed.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0   # units per second
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def take(self, amount: float) -> None:
+        """Wait until *amount* units are available, then consume them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._level < amount:
+                await asyncio.sleep((amount - self._level) / self.rate)
+                self._refill()
+            self._level -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Refund (positive) or charge (negative) units after the fact."""
+        self._refill()
+        self._level = min(self.capacity, self._level + delta)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter; an adaptive drop-in for ``asyncio.Semaphore``.
+
+    Parameters
+    ----------
+    initial : int
+        Starting concurrency.
+    max_limit : int | None
+        Upper bound for additive growth.  Defaults to ``4 * initial``.
+    grow_every : int
+        Number of consecutive successes before the limit grows by one.
+    rpm : int | None
+        Requests-per-minute budget (``None`` = unlimited).
+    tpm : int | None
+        Tokens-per-minute budget (``None`` = unlimited).
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        max_limit: Optional[int] = None,
+        grow_every: int = 50,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+    ) -> None:
+        self.limit = max(1, initial)
+        self.max_limit = max(self.limit, max_limit or 4 * self.limit)
+        self.grow_every = grow_every
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        """Return a slot and wake waiters."""
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.release()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator["AdaptiveLimiter"]:
+        """Hold a concurrency slot for a call estimated at *tokens* tokens.
+
+        RPM/TPM credit is taken *before* waiting for a slot, so a call
+        blocked on budget does not occupy concurrency.
+        """
+        if self._requests is not None:
+            await self._requests.take(1)
+        if self._tokens is not None and tokens:
+            await self._tokens.take(tokens)
+        async with self:
+            yield self
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the TPM budget once a call's real token usage is known."""
+        if self._tokens is not None and actual:
+            self._tokens.adjust(estimated - actual)
+
+    def on_success(self) -> None:
+        """Record a successful call; grow the limit every ``grow_every``."""
+        self._successes += 1
+        if self._successes >= self.grow_every:
+            self._successes = 0
+            if self.limit < self.max_limit:
+                self.limit += 1
+
+    def on_throttle(self) -> None:
+        """Record a throttled call; halve the limit (floor of one)."""
+        self._successes = 0
+        self.limit = max(1, self.limit // 2)
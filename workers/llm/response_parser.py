@@ -6,7 +6,7 @@ function names.  Handles common failure modes gracefully:
 
 1. Clean JSON → parse directly
 2. JSON inside markdown code fences → extract and parse
-3. JSON embedded in surrounding text → regex extract
+3. JSON embedded in surrounding text → scan for the first valid object
 4. Completely non-JSON → fall back to cleaned text as single prediction
 
 Usage::
@@ -26,14 +26,21 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads       # orjson.JSONDecodeError subclasses json's
+except ImportError:
+    _loads = json.loads
 
 # Max candidates to keep (truncate longer lists)
 MAX_K = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedResponse:
     """Result of parsing an LLM response for top-k predictions."""
     predictions: List[Dict[str, Any]]   # [{"name": str, "confidence": float}, ...]
@@ -44,29 +51,31 @@ class ParsedResponse:
 
 # ── Cleaning helpers ──────────────────────────────────────────────────────────
 
-# Patterns for extracting a name from noisy LLM output
-_PREFIX_PATTERNS = [
-    re.compile(r"^(?:the\s+)?(?:suggested\s+)?(?:function\s+)?name\s+(?:is|should\s+be|could\s+be)\s*:?\s*", re.IGNORECASE),
-    re.compile(r"^```\s*", re.MULTILINE),
-    re.compile(r"\s*```$", re.MULTILINE),
-    re.compile(r"^[`\"']+|[`\"']+$"),
-]
+# Leading prose prefix / code fence / quotes, or trailing fence / quotes —
+# stripped in a single left-to-right scan of noisy LLM output
+_STRIP_RE = re.compile(
+    r"^(?:(?:the\s+)?(?:suggested\s+)?(?:function\s+)?name\s+(?:is|should\s+be|could\s+be)\s*:?\s*"
+    r"|```\s*|[`\"'])+"
+    r"|(?:\s*```|[`\"'])+$",
+    re.IGNORECASE,
+)
 
-# Valid C identifier (snake_case)
-_VALID_IDENT = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+# First C-style identifier (2+ chars) embedded in free text
+_IDENT_SEARCH = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]+")
 
 
 def _clean_name(raw: str) -> str:
     """Clean a candidate name string: strip quotes, backticks, prefixes."""
-    name = raw.strip()
-    for pat in _PREFIX_PATTERNS:
-        name = pat.sub("", name).strip()
+    name = _STRIP_RE.sub("", raw.strip()).strip()
     # Take only the first line / first word if multi-line
-    name = name.split("\n")[0].strip()
+    name = name.partition("\n")[0].strip()
+    # Common case: already a bare identifier (no punctuation to strip)
+    if name.isidentifier():
+        return name
     # If it still contains spaces, try to extract just the identifier
     if " " in name:
         # Look for a snake_case identifier in the text
-        match = re.search(r"[a-zA-Z_][a-zA-Z0-9_]+", name)
+        match = _IDENT_SEARCH.search(name)
         if match:
             name = match.group(0)
     # Strip trailing punctuation
@@ -100,59 +109,63 @@ def _validate_prediction(pred: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return {"name": name, "confidence": confidence}
 
 
-def _extract_json_from_fences(text: str) -> Optional[str]:
-    """Extract JSON from markdown code fences like ```json ... ```."""
-    patterns = [
-        re.compile(r"```json\s*\n?(.*?)\n?\s*```", re.DOTALL | re.IGNORECASE),
-        re.compile(r"```\s*\n?(.*?)\n?\s*```", re.DOTALL),
-    ]
-    for pat in patterns:
+# Markdown code fences: ```json ... ``` first, then any ``` ... ```
+_FENCE_PATTERNS = (
+    re.compile(r"```json\s*\n?(.*?)\n?\s*```", re.DOTALL | re.IGNORECASE),
+    re.compile(r"```\s*\n?(.*?)\n?\s*```", re.DOTALL),
+)
+
+
+def _extract_json_from_fences(text: str) -> Optional[Tuple[int, int]]:
+    """Locate JSON inside markdown code fences like ```json ... ```.
+
+    Returns the ``(start, end)`` span of the fenced body within *text*.
+    """
+    for pat in _FENCE_PATTERNS:
         m = pat.search(text)
         if m:
-            return m.group(1).strip()
+            return m.span(1)
     return None
 
 
-def _extract_json_object(text: str) -> Optional[str]:
-    """Extract the first JSON object {...} from text using brace matching."""
-    start = text.find("{")
-    if start == -1:
-        return None
+_DECODER = json.JSONDecoder()
+
 
-    depth = 0
-    in_string = False
-    escape_next = False
-
-    for i in range(start, len(text)):
-        ch = text[i]
-        if escape_next:
-            escape_next = False
-            continue
-        if ch == "\\":
-            escape_next = True
-            continue
-        if ch == '"':
-            in_string = not in_string
-            continue
-        if in_string:
-            continue
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start:i + 1]
+def _extract_json_object(text: str) -> Optional[Tuple[int, int]]:
+    """Locate the first valid JSON object {...} in text.
 
+    Tries ``raw_decode`` at each ``{`` in turn, so brace and string
+    handling happen in the C JSON scanner rather than a Python loop.
+    Returns the ``(start, end)`` span of the object within *text*.
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            _, end = _DECODER.raw_decode(text, start)
+            return start, end
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
     return None
 
 
-def _parse_json_predictions(json_str: str) -> Optional[List[Dict[str, Any]]]:
-    """Try to parse a JSON string into a predictions list.
+def _parse_json_predictions(
+    text: str,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Try to parse ``text[start:end]`` into a predictions list.
 
     Handles both ``{"predictions": [...]}`` and bare ``[...]`` formats.
+    Surrounding whitespace in the span is tolerated by the JSON decoder.
     """
+    json_str = text if start == 0 and end is None else text[start:end]
+    # Every valid prediction carries a "name" key — skip the decode (and the
+    # JSONDecodeError it would raise) when the text cannot contain one
+    if '"name"' not in json_str:
+        return None
     try:
-        data = json.loads(json_str)
+        data = _loads(json_str)
     except json.JSONDecodeError:
         return None
 
@@ -181,9 +194,9 @@ def parse_topk_response(response_text: str, k: int = MAX_K) -> ParsedResponse:
 
     Tries increasingly lenient parsing strategies:
 
-    1. Direct ``json.loads()`` on full response text
+    1. Direct JSON parse of the full response text
     2. Extract JSON from markdown code fences
-    3. Extract first ``{...}`` block via brace matching
+    3. Extract first valid ``{...}`` object
     4. Fall back: treat cleaned text as a single prediction
 
     Parameters
@@ -208,19 +221,23 @@ def parse_topk_response(response_text: str, k: int = MAX_K) -> ParsedResponse:
             raw_text=raw,
         )
 
-    # Strategy 1: Direct JSON parse
-    preds = _parse_json_predictions(raw)
-    if preds:
-        return ParsedResponse(
-            predictions=preds[:k],
-            parse_ok=True,
-            raw_text=raw,
-        )
+    # Strategy 1: Direct JSON parse — the hot path; well-behaved models
+    # answer with bare JSON and return here.  Only text that opens like a
+    # JSON container is tried, so fenced or prose-wrapped answers skip a
+    # decode that would just raise.
+    if raw[0] in "{[":
+        preds = _parse_json_predictions(raw)
+        if preds:
+            return ParsedResponse(
+                predictions=preds[:k],
+                parse_ok=True,
+                raw_text=raw,
+            )
 
     # Strategy 2: Extract from code fences
-    from_fence = _extract_json_from_fences(raw)
-    if from_fence:
-        preds = _parse_json_predictions(from_fence)
+    fence_span = _extract_json_from_fences(raw)
+    if fence_span:
+        preds = _parse_json_predictions(raw, *fence_span)
         if preds:
             return ParsedResponse(
                 predictions=preds[:k],
@@ -229,9 +246,9 @@ def parse_topk_response(response_text: str, k: int = MAX_K) -> ParsedResponse:
             )
 
     # Strategy 3: Extract first JSON object
-    json_obj = _extract_json_object(raw)
-    if json_obj:
-        preds = _parse_json_predictions(json_obj)
+    obj_span = _extract_json_object(raw)
+    if obj_span:
+        preds = _parse_json_predictions(raw, *obj_span)
         if preds:
             return ParsedResponse(
                 predictions=preds[:k],
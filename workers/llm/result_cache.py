@@ -0,0 +1,100 @@
+"""
+In-flight + LRU cache of LLM results.
+
+Functions in an experiment often render to identical prompts (trivial
+getters, stripped stubs, inline wrappers).  :class:`LLMResultCache` makes
+each distinct request hit OpenRouter once:
+
+- a request identical to one still **in flight** awaits that call;
+- a request identical to a **completed** one is served from a bounded LRU.
+
+Failed calls are never cached, so a later duplicate retries.
+
+Usage::
+
+    from workers.llm.result_cache import LLMResultCache
+
+    cache = LLMResultCache()
+    key = LLMResultCache.key(model, prompt_text, temperature=0.0)
+    result, hit = await cache.get_or_call(key, lambda: call_llm(...))
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_MAXSIZE = 10_000
+
+
+class LLMResultCache:
+    """Deduplicates identical LLM requests within one process.
+
+    Parameters
+    ----------
+    maxsize : int
+        Completed results kept in the LRU.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._results: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def key(
+        model: str,
+        prompt_text: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """Digest of everything that determines the LLM response."""
+        h = hashlib.sha256(
+            f"{model}|{temperature}|{max_tokens}|{response_format}|".encode()
+        )
+        h.update(prompt_text.encode())
+        return h.digest()
+
+    async def get_or_call(
+        self,
+        key: bytes,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return ``(result, cache_hit)``, invoking *call* only on a miss."""
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return cached, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending), True
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as exc:
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved — waiters (if any) re-raise it
+            raise
+        finally:
+            del self._inflight[key]
+
+        self._results[key] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        fut.set_result(result)
+        return result, False
@@ -5,11 +5,11 @@ Async LLM Experiment Runner
 Standalone worker that drives an experiment end-to-end:
 
 1. Fetch experiment config from the API
-2. Fetch sanitized functions (leak-proof)
-3. Fetch already-completed IDs (for resume)
+2. Fetch already-completed IDs (for resume)
+3. Stream sanitized functions page by page (leak-proof)
 4. Build prompts from the template
-5. Call OpenRouter (OpenAI-compatible) with async concurrency
-6. POST result rows back to the API in batches
+5. Call OpenRouter (OpenAI-compatible) with adaptive async concurrency
+6. Stream result rows back to the API in batches as calls complete
 7. Trigger scoring + report generation
 
 Usage (CLI)::
@@ -28,19 +28,52 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import gzip
 import hashlib
 import json
 import logging
 import os
 import sys
 import time
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """Stdlib fallback for ``orjson.dumps``: compact JSON, dataclasses as dicts."""
+    return json.dumps(obj, separators=(",", ":"), default=asdict).encode("utf-8")
+
+
+try:
+    import orjson
+
+    _dumps_bytes: Callable[[Any], bytes] = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps_bytes = _json_dumps_bytes
+    _loads = json.loads
+
+from workers.llm.error_tracker import ErrorTracker
 from workers.llm.prompt import load_template, render_prompt
+from workers.llm.rate_limit import (
+    MAX_RETRIES,
+    AdaptiveLimiter,
+    backoff_delay,
+    estimate_tokens,
+    is_retryable,
+)
 from workers.llm.response_parser import parse_topk_response
+from workers.llm.result_cache import LLMResultCache
 from workers.llm.model_router import (
     call_llm,
     check_model_available,
@@ -55,11 +88,52 @@ log = logging.getLogger(__name__)
 
 OPENROUTER_BASE = "https://openrouter.ai/api/v1"
 DEFAULT_CONCURRENCY = 5
-BATCH_POST_SIZE = 10  # rows per POST to /results/batch
+PROMPT_CACHE_SIZE = 10_000  # distinct prompts remembered for in-run dedupe
+RENDER_CACHE_SIZE = 4096  # distinct function contexts rendered once per run
+BATCH_POST_SIZE = 100  # rows per POST to /results/batch
+GZIP_MIN_BYTES = 4096  # smaller batch bodies are sent uncompressed
+POST_CONCURRENCY = 4  # batch POSTs in flight at once
+BATCH_FLUSH_SECONDS = 2.0  # flush a partial batch after this long without rows
+FUNCTIONS_PAGE_SIZE = 200  # rows per GET /llm/functions page
+FAIL_FAST_ERRORS = 50  # consecutive failures that abort the run
+MAX_RESPONSE_CHARS = 4096  # suggested cap for --max-response-chars (off by default)
 
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
+@dataclass(slots=True)
+class ResultRow:
+    """One result row on its way to ``POST /results/batch``.
+
+    Mirrors :class:`data.schema.LLMResultRow`; serialised directly by
+    :func:`_dumps_bytes` without an intermediate dict.
+    """
+
+    experiment_id: str
+    run_id: str
+    job_id: str
+    test_case: str
+    opt: str
+    dwarf_function_id: str
+    ghidra_func_id: Optional[str]
+    model: str
+    prompt_template_id: str
+    temperature: float
+    response_text: str
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    latency_ms: int
+    metadata: Dict[str, Any]
+    timestamp: str = ""  # stamped once per batch by the writer
+    prompt_text: str = ""
+    prompt_sha256: Optional[str] = None
+    # None = the raw response; the API aliases it from response_text
+    predicted_name: Optional[str] = None
+    # left None — filled post-hoc by scorer
+    ground_truth_name: Optional[str] = None
+
+
 def _job_id(
     experiment_id: str,
     run_id: str,
@@ -68,17 +142,121 @@ def _job_id(
     prompt_template_id: str,
     temperature: float,
 ) -> str:
-    """Deterministic job ID for idempotency."""
-    key = "|".join([
-        experiment_id, run_id, dwarf_function_id,
-        model, prompt_template_id, str(temperature),
-    ])
-    return hashlib.sha256(key.encode()).hexdigest()[:16]
+    """Deterministic job ID for idempotency (16 hex chars, BLAKE2b-64)."""
+    return _job_id_factory(
+        experiment_id, run_id, model, prompt_template_id, temperature,
+    )(dwarf_function_id)
+
+
+def _job_id_factory(
+    experiment_id: str,
+    run_id: str,
+    model: str,
+    prompt_template_id: str,
+    temperature: float,
+) -> Callable[[str], str]:
+    """Return ``f(dwarf_function_id) -> job_id`` for one run.
+
+    Hashes ``experiment_id|run_id|dwarf_function_id|model|prompt_template_id|temperature``
+    like :func:`_job_id`, but the run-constant prefix is absorbed once and
+    each call only copies the hash state and feeds the function ID.
+    """
+    base = hashlib.blake2b(f"{experiment_id}|{run_id}|".encode(), digest_size=8)
+    suffix = f"|{model}|{prompt_template_id}|{temperature}".encode()
+
+    def job_id(dwarf_function_id: str) -> str:
+        h = base.copy()
+        h.update(dwarf_function_id.encode())
+        h.update(suffix)
+        return h.hexdigest()
+
+    return job_id
+
+
+_ts_cache: tuple[float, str] = (0.0, "")
 
 
 def _ts() -> str:
-    """ISO-8601 UTC timestamp."""
-    return datetime.now(timezone.utc).isoformat()
+    """ISO-8601 UTC timestamp, reused for up to one second."""
+    global _ts_cache
+    now = time.time()
+    cached_t, cached_s = _ts_cache
+    if now - cached_t < 1.0:
+        return cached_s
+    s = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    _ts_cache = (now, s)
+    return s
+
+
+def _api_client(concurrency: int) -> httpx.AsyncClient:
+    """HTTP client for the Reforge API (config, functions, result batches).
+
+    HTTP/2 is only negotiated over TLS, so a plain-HTTP local API keeps
+    using pooled HTTP/1.1 keep-alive connections.
+    """
+    return httpx.AsyncClient(
+        http2=_HAS_H2,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=max(100, concurrency * 4),
+            max_keepalive_connections=max(20, concurrency * 2),
+            keepalive_expiry=120.0,
+        ),
+    )
+
+
+def _openrouter_client(concurrency: int) -> httpx.AsyncClient:
+    """HTTP client for OpenRouter, sized for *concurrency* in-flight calls.
+
+    Kept separate from the Reforge API client so internal batch POSTs never
+    evict OpenRouter keep-alive connections.  Uses HTTP/2 multiplexing when
+    ``h2`` is installed (``httpx[http2]``).
+    """
+    return httpx.AsyncClient(
+        http2=_HAS_H2,
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=concurrency * 2,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
+# Process-wide clients, reused across run_experiment calls so notebook loops
+# keep their warm connection pools.  Clients are bound to the event loop that
+# created them; a new loop (e.g. a second asyncio.run) gets fresh ones.
+_clients: Optional[Tuple[httpx.AsyncClient, httpx.AsyncClient]] = None
+_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+_clients_size = 0
+
+
+async def _get_clients(pool_size: int) -> Tuple[httpx.AsyncClient, httpx.AsyncClient]:
+    """Return the shared ``(api_client, openrouter_client)`` pair.
+
+    Rebuilt when missing, closed, created on another event loop, or sized
+    for fewer than *pool_size* concurrent calls.
+    """
+    global _clients, _clients_loop, _clients_size
+    loop = asyncio.get_running_loop()
+    if _clients is not None and _clients_loop is loop and (
+        _clients[0].is_closed or _clients[1].is_closed or pool_size > _clients_size
+    ):
+        await close_clients()
+    if _clients is None or _clients_loop is not loop:
+        _clients = (_api_client(pool_size), _openrouter_client(pool_size))
+        _clients_loop = loop
+        _clients_size = pool_size
+    return _clients
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP clients (call once at shutdown)."""
+    global _clients, _clients_loop, _clients_size
+    if _clients is not None:
+        for c in _clients:
+            await c.aclose()
+    _clients, _clients_loop, _clients_size = None, None, 0
 
 
 # ─── API helpers (async) ─────────────────────────────────────────────────────
@@ -87,10 +265,10 @@ async def _fetch_experiment(client: httpx.AsyncClient, api_base: str, experiment
     """GET /data/experiments/{id}."""
     resp = await client.get(f"{api_base}/data/experiments/{experiment_id}")
     resp.raise_for_status()
-    return resp.json()
+    return _loads(resp.content)
 
 
-async def _fetch_functions(
+async def _iter_functions(
     client: httpx.AsyncClient,
     api_base: str,
     *,
@@ -100,22 +278,36 @@ async def _fetch_functions(
     context_level: str = "L0",
     limit: int,
     test_case: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """GET /llm/functions with pagination to fetch all rows."""
+    page_size: int = FUNCTIONS_PAGE_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield rows from GET /llm/functions one page at a time.
+
+    At most *limit* rows are yielded (all rows if ``limit <= 0``).
+    """
     params: Dict[str, Any] = {
         "opt": opt,
         "tier": tier,
         "metadata_mode": metadata_mode,
         "context_level": context_level,
-        "limit": limit if limit > 0 else 5000,
         "offset": 0,
     }
     if test_case:
         params["test_case"] = test_case
 
-    resp = await client.get(f"{api_base}/llm/functions", params=params)
-    resp.raise_for_status()
-    return resp.json()
+    remaining = limit if limit > 0 else None
+    while remaining is None or remaining > 0:
+        page_limit = page_size if remaining is None else min(page_size, remaining)
+        params["limit"] = page_limit
+        resp = await client.get(f"{api_base}/llm/functions", params=params)
+        resp.raise_for_status()
+        page = _loads(resp.content)
+        for fn in page:
+            yield fn
+        if len(page) < page_limit:
+            break
+        params["offset"] += len(page)
+        if remaining is not None:
+            remaining -= len(page)
 
 
 async def _fetch_completed_ids(
@@ -123,30 +315,35 @@ async def _fetch_completed_ids(
     api_base: str,
     experiment_id: str,
     run_id: str,
-) -> set[str]:
+) -> frozenset[str]:
     """GET /results/{experiment_id}/completed-ids?run_id=..."""
     resp = await client.get(
         f"{api_base}/results/{experiment_id}/completed-ids",
         params={"run_id": run_id},
     )
     if resp.status_code == 404:
-        return set()
+        return frozenset()
     resp.raise_for_status()
-    data = resp.json()
-    return set(data.get("completed_ids", []))
+    data = _loads(resp.content)
+    return frozenset(data.get("completed_ids", []))
 
 
 async def _post_batch(
     client: httpx.AsyncClient,
     api_base: str,
-    rows: List[Dict[str, Any]],
+    rows: List[Any],
 ) -> Dict[str, Any]:
-    """POST /results/batch."""
-    resp = await client.post(f"{api_base}/results/batch", json=rows)
+    """POST /results/batch (gzip-compressed above ``GZIP_MIN_BYTES``)."""
+    body = _dumps_bytes(rows)
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    resp = await client.post(f"{api_base}/results/batch", content=body, headers=headers)
     if resp.status_code == 422:
         log.error("Batch 422 detail: %s", resp.text[:500])
     resp.raise_for_status()
-    return resp.json()
+    return _loads(resp.content)
 
 
 async def _trigger_scoring(
@@ -157,7 +354,7 @@ async def _trigger_scoring(
     """POST /results/{experiment_id}/score."""
     resp = await client.post(f"{api_base}/results/{experiment_id}/score")
     resp.raise_for_status()
-    return resp.json()
+    return _loads(resp.content)
 
 
 async def _fetch_report(
@@ -168,7 +365,50 @@ async def _fetch_report(
     """GET /results/{experiment_id}/report."""
     resp = await client.get(f"{api_base}/results/{experiment_id}/report")
     resp.raise_for_status()
-    return resp.json()
+    return _loads(resp.content)
+
+
+def _apply_topk(rows: List[ResultRow], k: int) -> None:
+    """Parse each row's top-*k* ``response_text`` into ``predicted_name``
+    (the top-1) and the ``predictions`` metadata, in place."""
+    for row in rows:
+        parsed = parse_topk_response(row.response_text, k=k)
+        predictions = parsed.predictions
+        row.predicted_name = predictions[0]["name"] if predictions else ""
+        meta = row.metadata
+        meta["predictions"] = predictions
+        meta["parse_ok"] = parsed.parse_ok
+        meta["parse_error"] = parsed.parse_error
+        meta["all_candidate_names"] = [p["name"] for p in predictions]
+        meta["top_k"] = k
+
+
+def _truncate_responses(rows: List[ResultRow], max_chars: int) -> None:
+    """Cut each ``response_text`` to *max_chars*, recording the original
+    length as ``response_truncated_from`` metadata, in place."""
+    for row in rows:
+        n = len(row.response_text)
+        if n > max_chars:
+            row.metadata["response_truncated_from"] = n
+            row.response_text = row.response_text[:max_chars]
+
+
+def _finish_batch(rows: List[ResultRow], top_k: int, max_chars: Optional[int]) -> None:
+    """Top-k parsing, then truncation (so parsing sees the full response)."""
+    if top_k > 1:
+        _apply_topk(rows, top_k)
+    if max_chars:
+        _truncate_responses(rows, max_chars)
+
+
+async def _prepend(
+    first: Dict[str, Any],
+    rest: AsyncIterator[Dict[str, Any]],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield *first*, then everything from *rest*."""
+    yield first
+    async for item in rest:
+        yield item
 
 
 # ─── OpenRouter call ─────────────────────────────────────────────────────────
@@ -190,7 +430,14 @@ async def run_experiment(
     openrouter_key: Optional[str] = None,
     run_id: Optional[str] = None,
     concurrency: int = DEFAULT_CONCURRENCY,
+    max_concurrency: Optional[int] = None,
+    rpm: Optional[int] = None,
+    tpm: Optional[int] = None,
     dry_run: bool = False,
+    store_prompt_text: bool = False,
+    max_response_chars: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    llm_client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """Execute an experiment end-to-end.
 
@@ -205,15 +452,42 @@ async def run_experiment(
     run_id : str | None
         Unique run ID. Auto-generated if not provided.
     concurrency : int
-        Max concurrent LLM calls (asyncio.Semaphore).
+        Initial concurrent LLM calls (adapted at runtime, see
+        :class:`~workers.llm.rate_limit.AdaptiveLimiter`).
+    max_concurrency : int | None
+        Upper bound for adaptive growth.  Defaults to ``4 * concurrency``.
+    rpm : int | None
+        OpenRouter requests-per-minute budget.  Defaults to the experiment
+        config's ``rpm`` (unlimited if unset).
+    tpm : int | None
+        OpenRouter tokens-per-minute budget.  Defaults to the experiment
+        config's ``tpm`` (unlimited if unset).
     dry_run : bool
         If True, build prompts but skip LLM calls and result posting.
+    store_prompt_text : bool
+        If True, send the full ``prompt_text`` with every result row.
+        Otherwise only its ``prompt_sha256`` is sent; the prompt can be
+        rebuilt from the template and ``dwarf_function_id``.
+    max_response_chars : int | None
+        Opt-in cap (e.g. ``MAX_RESPONSE_CHARS``): longer ``response_text``
+        values (verbose reasoning models) are truncated in result rows,
+        with the original length stored as
+        ``metadata["response_truncated_from"]``.  Top-k parsing still sees
+        the full response, and the repair endpoint skips truncated rows.
+        ``None`` (default) or ``0`` keeps responses whole.
+    client : httpx.AsyncClient | None
+        Client for the Reforge API.  Defaults to the process-wide shared
+        client (see :func:`close_clients`).
+    llm_client : httpx.AsyncClient | None
+        Client for OpenRouter.  Defaults to the process-wide shared client.
 
     Returns
     -------
     dict
         Summary with keys: experiment_id, run_id, total, completed, skipped,
-        new, errors, dry_run, report (if scoring succeeded).
+        new, errors, error_details, aborted, dry_run, report (if scoring
+        succeeded).  ``error_details`` holds a bounded sample of the errors
+        (see :class:`~workers.llm.error_tracker.ErrorTracker`).
     """
     # ── Resolve API key ───────────────────────────────────────────────────
     if openrouter_key is None:
@@ -232,296 +506,470 @@ async def run_experiment(
 
     # ── Progress helper (tqdm if available, else print) ───────────────────
     try:
-        from tqdm.asyncio import tqdm as async_tqdm  # type: ignore[import-untyped]
-        _has_tqdm = True
+        from tqdm import tqdm  # type: ignore[import-untyped]
     except ImportError:
-        async_tqdm = None  # type: ignore[assignment]
-        _has_tqdm = False
-
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # 1. Fetch experiment config
-        exp = await _fetch_experiment(client, api_base, experiment_id)
-        model = exp["model"]
-        temperature = exp.get("temperature", 0.0)
-        max_tokens = exp.get("max_tokens")
-        prompt_template_id = exp["prompt_template_id"]
-        opt = exp.get("opt", "O0")
-        tier = exp.get("tier", "GOLD")
-        metadata_mode = exp.get("metadata_mode", "STRICT")
-        context_level = exp.get("context_level", "L0")
-        limit = exp.get("limit", 0)
-        test_case = exp.get("test_case") or None
-        top_k = exp.get("top_k", 1)
-        response_format = exp.get("response_format")
-
-        log.info("Config: model=%s, opt=%s, tier=%s, limit=%d, mode=%s, ctx=%s, top_k=%d",
-                 model, opt, tier, limit, metadata_mode, context_level, top_k)
-
-        # 2. Load prompt template
-        template = load_template(prompt_template_id)
-        log.info("Loaded prompt template: %s", prompt_template_id)
-
-        # 3. Fetch sanitized functions (with structural context)
-        functions = await _fetch_functions(
+        tqdm = None  # type: ignore[assignment]
+
+    if client is None or llm_client is None:
+        shared_api, shared_llm = await _get_clients(max_concurrency or 4 * concurrency)
+        client = client or shared_api
+        llm_client = llm_client or shared_llm
+
+    # 1. Fetch experiment config and completed IDs (resume support)
+    # concurrently: the latter needs only the experiment and run IDs
+    exp, completed_ids = await asyncio.gather(
+        _fetch_experiment(client, api_base, experiment_id),
+        _fetch_completed_ids(client, api_base, experiment_id, run_id),
+    )
+    model = exp["model"]
+    temperature = exp.get("temperature", 0.0)
+    max_tokens = exp.get("max_tokens")
+    prompt_template_id = exp["prompt_template_id"]
+    opt = exp.get("opt", "O0")
+    tier = exp.get("tier", "GOLD")
+    metadata_mode = exp.get("metadata_mode", "STRICT")
+    context_level = exp.get("context_level", "L0")
+    limit = exp.get("limit", 0)
+    test_case = exp.get("test_case") or None
+    top_k = exp.get("top_k", 1)
+    response_format = exp.get("response_format")
+    rpm = rpm or exp.get("rpm")
+    tpm = tpm or exp.get("tpm")
+
+    log.info("Config: model=%s, opt=%s, tier=%s, limit=%d, mode=%s, ctx=%s, top_k=%d",
+             model, opt, tier, limit, metadata_mode, context_level, top_k)
+    log.info("Already completed: %d functions", len(completed_ids))
+
+    # 2. Stream sanitized functions (with structural context) page by
+    # page, dropping the ones already completed.  Nothing holds more than
+    # a page of rows, and LLM calls start after the first page arrives.
+    n_functions = 0
+    skipped = 0
+
+    async def _todo() -> AsyncIterator[Dict[str, Any]]:
+        nonlocal n_functions, skipped
+        seen = completed_ids  # local binding for the per-row membership test
+        async for fn in _iter_functions(
             client, api_base,
             opt=opt, tier=tier, metadata_mode=metadata_mode,
             context_level=context_level,
             limit=limit, test_case=test_case,
+        ):
+            n_functions += 1
+            if fn["dwarf_function_id"] in seen:
+                skipped += 1
+            else:
+                yield fn
+
+    # 3. Load the prompt template while peeking at the first remaining
+    # function (only as far as needed to tell whether there is any work)
+    todo = _todo()
+    template, first = await asyncio.gather(
+        asyncio.to_thread(load_template, prompt_template_id),
+        anext(todo, None),
+    )
+    log.info("Loaded prompt template: %s", prompt_template_id)
+
+    # Identical function contexts (stubs, wrappers, empty L1/L2 context)
+    # render once.  The cache is local to this run, so it never outlives
+    # the template it was built from.
+    @lru_cache(maxsize=RENDER_CACHE_SIZE)
+    def _render(
+        c_raw: str,
+        calls: Optional[str],
+        cfg_summary: Optional[str],
+        variables: Optional[str],
+    ) -> str:
+        return render_prompt(template, c_raw, calls=calls,
+                             cfg_summary=cfg_summary, variables=variables)
+
+    def _prompt_for(fn: Dict[str, Any]) -> str:
+        return _render(fn.get("c_raw", ""), fn.get("calls_text"),
+                       fn.get("cfg_text"), fn.get("variables_text"))
+
+    if first is None and n_functions == 0:
+        log.warning("No functions to process — exiting")
+        return {
+            "experiment_id": experiment_id,
+            "run_id": run_id,
+            "total": 0, "completed": 0, "skipped": 0, "new": 0,
+            "errors": 0, "dry_run": dry_run,
+        }
+
+    if first is None:
+        log.info("All %d functions already completed — nothing to do", n_functions)
+        return {
+            "experiment_id": experiment_id,
+            "run_id": run_id,
+            "total": n_functions,
+            "completed": len(completed_ids),
+            "skipped": skipped, "new": 0, "errors": 0,
+            "dry_run": dry_run,
+        }
+
+    # ── Pre-flight: check model availability & profile ─────────────────
+    profile = get_profile(model)
+    prov = detect_provider(model)
+    log.info("Model router: provider=%s, json_mode=%s, json_schema=%s, "
+             "reasoning=%s, notes=%s",
+             prov.value, profile.supports_json_mode,
+             profile.supports_json_schema, profile.is_reasoning_model,
+             profile.notes)
+
+    if dry_run:
+        # Build prompts to validate, but don't call LLM
+        # Skip availability check — no API key needed for dry runs
+        new = 0
+        async for fn in _prepend(first, todo):
+            new += 1
+            if new > 3:
+                continue  # still drained, to count the remaining work
+            prompt = _prompt_for(fn)
+            log.info("DRY RUN prompt preview (%s):\n%s",
+                     fn["dwarf_function_id"], prompt[:300])
+        log.info("DRY RUN: would process %d functions with %s (ctx=%s, %d skipped)",
+                 new, model, context_level, skipped)
+        return {
+            "experiment_id": experiment_id,
+            "run_id": run_id,
+            "total": n_functions,
+            "completed": len(completed_ids),
+            "skipped": skipped, "new": new,
+            "errors": 0, "dry_run": True,
+        }
+
+    # Availability check requires a valid API key — only for real runs
+    availability = await check_model_available(llm_client, openrouter_key, model)
+    if not availability.get("available"):
+        err_msg = availability.get("error", "unknown")
+        log.error("Model %s is NOT available on OpenRouter: %s", model, err_msg)
+        raise RuntimeError(
+            f"Model '{model}' is not available on OpenRouter. "
+            f"Error: {err_msg}. "
+            f"Update the model in the experiment config."
         )
-        log.info("Fetched %d sanitized functions", len(functions))
-
-        if not functions:
-            log.warning("No functions to process — exiting")
-            return {
-                "experiment_id": experiment_id,
-                "run_id": run_id,
-                "total": 0, "completed": 0, "skipped": 0, "new": 0,
-                "errors": 0, "dry_run": dry_run,
-            }
-
-        # 4. Fetch completed IDs (resume support)
-        completed_ids = await _fetch_completed_ids(
-            client, api_base, experiment_id, run_id,
-        )
-        log.info("Already completed: %d functions", len(completed_ids))
-
-        # 5. Filter to remaining work
-        todo = [
-            f for f in functions
-            if f["dwarf_function_id"] not in completed_ids
-        ]
-        skipped = len(functions) - len(todo)
-        log.info("Remaining work: %d functions (%d skipped)", len(todo), skipped)
-
-        if not todo:
-            log.info("All functions already completed — nothing to do")
-            return {
-                "experiment_id": experiment_id,
-                "run_id": run_id,
-                "total": len(functions),
-                "completed": len(completed_ids),
-                "skipped": skipped, "new": 0, "errors": 0,
-                "dry_run": dry_run,
-            }
-
-        # ── Pre-flight: check model availability & profile ─────────────────
-        profile = get_profile(model)
-        prov = detect_provider(model)
-        log.info("Model router: provider=%s, json_mode=%s, json_schema=%s, "
-                 "reasoning=%s, notes=%s",
-                 prov.value, profile.supports_json_mode,
-                 profile.supports_json_schema, profile.is_reasoning_model,
-                 profile.notes)
-
-        if dry_run:
-            # Build prompts to validate, but don't call LLM
-            # Skip availability check — no API key needed for dry runs
-            for fn in todo[:3]:
-                prompt = render_prompt(
-                    template,
-                    fn.get("c_raw", ""),
-                    calls=fn.get("calls_text"),
-                    cfg_summary=fn.get("cfg_text"),
-                    variables=fn.get("variables_text"),
-                )
-                log.info("DRY RUN prompt preview (%s):\n%s",
-                         fn["dwarf_function_id"], prompt[:300])
-            log.info("DRY RUN: would process %d functions with %s (ctx=%s)",
-                     len(todo), model, context_level)
-            return {
-                "experiment_id": experiment_id,
-                "run_id": run_id,
-                "total": len(functions),
-                "completed": len(completed_ids),
-                "skipped": skipped, "new": len(todo),
-                "errors": 0, "dry_run": True,
-            }
-
-        # Availability check requires a valid API key — only for real runs
-        availability = await check_model_available(client, openrouter_key, model)
-        if not availability.get("available"):
-            err_msg = availability.get("error", "unknown")
-            log.error("Model %s is NOT available on OpenRouter: %s", model, err_msg)
-            raise RuntimeError(
-                f"Model '{model}' is not available on OpenRouter. "
-                f"Error: {err_msg}. "
-                f"Update the model in the experiment config."
-            )
-        log.info("Model %s is available (ctx_length=%s)",
-                 model, availability.get("context_length"))
-
-        # 6. Process with concurrency limit
-        sem = asyncio.Semaphore(concurrency)
-        results: List[Dict[str, Any]] = []
-        errors: List[Dict[str, Any]] = []
-
-        async def _process_one(fn: Dict[str, Any]) -> None:
-            """Process a single function: render → call LLM → collect."""
-            func_id = fn["dwarf_function_id"]
-            prompt_text = render_prompt(
-                template,
-                fn.get("c_raw", ""),
-                calls=fn.get("calls_text"),
-                cfg_summary=fn.get("cfg_text"),
-                variables=fn.get("variables_text"),
-            )
-            jid = _job_id(experiment_id, run_id, func_id,
-                          model, prompt_template_id, temperature)
-
-            async with sem:
+    log.info("Model %s is available (ctx_length=%s)",
+             model, availability.get("context_length"))
+
+    # 4. Process with adaptive concurrency limit
+    limiter = AdaptiveLimiter(concurrency, max_limit=max_concurrency, rpm=rpm, tpm=tpm)
+    job_id_for = _job_id_factory(experiment_id, run_id, model,
+                                 prompt_template_id, temperature)
+    errtrack = ErrorTracker(fail_after=FAIL_FAST_ERRORS)
+    produced = 0
+
+    # 5. Stream result rows to the API in batches while LLM calls run.  A
+    # writer task flushes every BATCH_POST_SIZE rows, or after
+    # BATCH_FLUSH_SECONDS of quiet, with a few POSTs in flight at once.
+    row_q: asyncio.Queue[Optional[ResultRow]] = asyncio.Queue()
+    post_sem = asyncio.Semaphore(POST_CONCURRENCY)
+    written = 0
+
+    async def _post_one(i: int, batch: List[ResultRow]) -> None:
+        nonlocal written
+        if top_k > 1:
+            await asyncio.to_thread(_finish_batch, batch, top_k, max_response_chars)
+        elif max_response_chars:
+            _truncate_responses(batch, max_response_chars)
+        async with post_sem:
+            try:
+                resp = await _post_batch(client, api_base, batch)
+            except Exception as exc:
+                log.error("Batch POST failed at offset %d: %s", i, exc)
+                errtrack.record(batch_offset=i, error=str(exc))
+                return
+        written += resp.get("rows_written", 0)
+        log.info("Batch %d-%d: %d written, %d skipped",
+                 i, i + len(batch),
+                 resp.get("rows_written", 0),
+                 resp.get("rows_skipped", 0))
+
+    async def _writer() -> None:
+        """Drain ``row_q`` into batch POSTs until the ``None`` sentinel."""
+        # Only POSTs still in flight are kept; the final drain awaits those
+        pending: set[asyncio.Task] = set()
+        batch: List[ResultRow] = []
+        offset = 0
+        while True:
+            try:
+                row = await asyncio.wait_for(row_q.get(), timeout=BATCH_FLUSH_SECONDS)
+                timed_out = False
+            except asyncio.TimeoutError:
+                row, timed_out = None, True
+            if row is not None:
+                batch.append(row)
+                if len(batch) < BATCH_POST_SIZE:
+                    continue
+            if batch:
+                ts = _ts()
+                for r in batch:
+                    r.timestamp = ts
+                task = asyncio.create_task(_post_one(offset, batch))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                offset += len(batch)
+                batch = []
+            if not timed_out and row is None:
+                break
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def _call_with_retry(prompt_text: str, func_id: str) -> Dict[str, Any]:
+        """Call the LLM under the limiter, retrying throttled attempts."""
+        est = estimate_tokens(prompt_text, max_tokens)
+        attempt = 0
+        while True:
+            async with limiter.slot(tokens=est):
                 try:
-                    llm_result = await call_llm(
-                        client, openrouter_key, model,
+                    result = await call_llm(
+                        llm_client, openrouter_key, model,
                         prompt_text,
                         temperature=temperature,
                         max_tokens=max_tokens,
                         response_format=response_format,
                     )
                 except Exception as exc:
-                    log.error("LLM call failed for %s: %s", func_id, exc)
-                    errors.append({"dwarf_function_id": func_id, "error": str(exc)})
-                    return
-
-            # Parse response (top-k or single-name)
-            response_text = llm_result["response_text"]
-            if top_k > 1:
-                parsed = parse_topk_response(response_text, k=top_k)
-                predicted_name = parsed.predictions[0]["name"] if parsed.predictions else ""
-                meta_predictions = parsed.predictions
-                meta_parse_ok = parsed.parse_ok
-                meta_parse_error = parsed.parse_error
-                all_candidate_names = [p["name"] for p in parsed.predictions]
-            else:
-                predicted_name = response_text
-                meta_predictions = None
-                meta_parse_ok = None
-                meta_parse_error = None
-                all_candidate_names = None
-
-            # Assemble result row
-            row_metadata: Dict[str, Any] = {
-                "metadata_mode": metadata_mode,
-                "context_level": context_level,
-            }
-            if top_k > 1:
-                row_metadata["predictions"] = meta_predictions
-                row_metadata["parse_ok"] = meta_parse_ok
-                row_metadata["parse_error"] = meta_parse_error
-                row_metadata["all_candidate_names"] = all_candidate_names
-                row_metadata["top_k"] = top_k
-
-            row = {
-                "experiment_id": experiment_id,
-                "run_id": run_id,
-                "job_id": jid,
-                "timestamp": _ts(),
-                "test_case": fn.get("test_case") or "",
-                "opt": fn.get("opt") or opt,
-                "dwarf_function_id": func_id,
-                "ghidra_func_id": fn.get("ghidra_func_id"),
-                "model": model,
-                "prompt_template_id": prompt_template_id,
-                "temperature": temperature,
-                "prompt_text": prompt_text,
-                "response_text": response_text,
-                "prompt_tokens": llm_result["prompt_tokens"],
-                "completion_tokens": llm_result["completion_tokens"],
-                "total_tokens": llm_result["total_tokens"],
-                "latency_ms": llm_result["latency_ms"],
-                # predicted_name = top-1 from parsed response
-                "predicted_name": predicted_name,
-                # ground_truth_name left None — filled post-hoc by scorer
-                "ground_truth_name": None,
-                "metadata": row_metadata,
-            }
-            results.append(row)
-
-        # Create tasks
-        tasks = [_process_one(fn) for fn in todo]
-
-        if _has_tqdm and async_tqdm is not None:
-            # Use tqdm progress bar
-            for coro in async_tqdm(  # type: ignore[misc]
-                asyncio.as_completed(tasks),
-                total=len(tasks),
-                desc=f"LLM calls ({model})",
-                unit="fn",
-            ):
-                await coro
+                    if not (is_retryable(exc) and attempt < MAX_RETRIES):
+                        raise
+                    limiter.on_throttle()
+                    log.warning("Throttled on %s (attempt %d/%d, limit → %d): %s",
+                                func_id, attempt + 1, MAX_RETRIES,
+                                limiter.limit, exc)
+                    delay = backoff_delay(attempt, exc)
+                else:
+                    limiter.on_success()
+                    limiter.settle(est, result["total_tokens"])
+                    return result
+            # Back off outside the limiter so the slot is freed meanwhile
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # Identical prompts (e.g. inline wrappers rendering to the same C)
+    # share one LLM call.  Only at temperature 0, where the response
+    # would be the same anyway.
+    result_cache = LLMResultCache(PROMPT_CACHE_SIZE) if temperature == 0 else None
+
+    async def _cached_call(prompt_text: str, func_id: str) -> Tuple[Dict[str, Any], bool]:
+        """Return ``(llm_result, cache_hit)`` for *prompt_text*."""
+        if result_cache is None:
+            return await _call_with_retry(prompt_text, func_id), False
+        key = LLMResultCache.key(
+            model, prompt_text,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+        result, hit = await result_cache.get_or_call(
+            key, lambda: _call_with_retry(prompt_text, func_id),
+        )
+        if hit:
+            result = {**result, "latency_ms": 0}
+        return result, hit
+
+    async def _process_one(fn: Dict[str, Any]) -> None:
+        """Process a single function: render → call LLM → enqueue row."""
+        nonlocal produced
+        func_id = fn["dwarf_function_id"]
+        prompt_text = _prompt_for(fn)
+        jid = job_id_for(func_id)
+
+        try:
+            llm_result, cache_hit = await _cached_call(prompt_text, func_id)
+        except Exception as exc:
+            log.error("LLM call failed for %s: %s", func_id, exc)
+            errtrack.record(dwarf_function_id=func_id, error=str(exc))
+            return
+        errtrack.record_success()
+
+        # Assemble result row.  Top-k responses are parsed later, a whole
+        # batch at a time off the event loop (see _post_one); single-name
+        # rows omit predicted_name, which the API aliases from response_text.
+        row_metadata: Dict[str, Any] = {
+            "metadata_mode": metadata_mode,
+            "context_level": context_level,
+        }
+        if cache_hit:
+            row_metadata["prompt_cache_hit"] = True
+
+        row = ResultRow(
+            experiment_id=experiment_id,
+            run_id=run_id,
+            job_id=jid,
+            test_case=fn.get("test_case") or "",
+            opt=fn.get("opt") or opt,
+            dwarf_function_id=func_id,
+            ghidra_func_id=fn.get("ghidra_func_id"),
+            model=model,
+            prompt_template_id=prompt_template_id,
+            temperature=temperature,
+            response_text=llm_result["response_text"],
+            prompt_tokens=llm_result["prompt_tokens"],
+            completion_tokens=llm_result["completion_tokens"],
+            total_tokens=llm_result["total_tokens"],
+            latency_ms=llm_result["latency_ms"],
+            metadata=row_metadata,
+        )
+        if store_prompt_text:
+            row.prompt_text = prompt_text
         else:
-            # Fallback: simple progress
-            done = 0
-            for coro in asyncio.as_completed(tasks):
-                await coro
-                done += 1
-                if done % 10 == 0 or done == len(tasks):
-                    print(f"  Progress: {done}/{len(tasks)}", flush=True)
-
-        log.info("LLM calls complete: %d results, %d errors",
-                 len(results), len(errors))
+            row.prompt_sha256 = hashlib.sha256(prompt_text.encode()).hexdigest()
+        produced += 1
+        await row_q.put(row)
+
+    # Bounded worker pool fed from a bounded queue: only as many coroutines
+    # as the limiter can ever admit exist at once, and the producer stays
+    # at most a page ahead of them
+    done = 0
+    pbar = (
+        tqdm(desc=f"LLM calls ({model})", unit="fn")
+        if tqdm is not None else None
+    )
+    n_workers = limiter.max_limit
+    work_q: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue(
+        maxsize=FUNCTIONS_PAGE_SIZE,
+    )
 
-        # 7. POST results in batches
-        written = 0
-        for i in range(0, len(results), BATCH_POST_SIZE):
-            batch = results[i : i + BATCH_POST_SIZE]
+    async def _producer() -> None:
+        try:
+            async for fn in _prepend(first, todo):
+                await work_q.put(fn)
+        except Exception as exc:
+            log.error("Fetching functions failed after %d rows: %s",
+                      n_functions, exc)
+            errtrack.record(functions_offset=n_functions, error=str(exc))
+        for _ in range(n_workers):
+            await work_q.put(None)
+
+    async def _worker() -> None:
+        nonlocal done
+        while not aborted and (fn := await work_q.get()) is not None:
             try:
-                resp = await _post_batch(client, api_base, batch)
-                written += resp.get("rows_written", 0)
-                log.info("Batch %d-%d: %d written, %d skipped",
-                         i, i + len(batch),
-                         resp.get("rows_written", 0),
-                         resp.get("rows_skipped", 0))
+                await _process_one(fn)
             except Exception as exc:
-                log.error("Batch POST failed at offset %d: %s", i, exc)
-                errors.append({"batch_offset": i, "error": str(exc)})
-
-        log.info("Total written: %d rows", written)
-
-        # 8. Trigger scoring
-        report = None
-        if written > 0:
-            try:
-                score_resp = await _trigger_scoring(client, api_base, experiment_id)
-                log.info("Scoring: %s", json.dumps(score_resp, indent=2)[:300])
-
-                report_resp = await _fetch_report(client, api_base, experiment_id)
-                report = report_resp
-                log.info("Report generated for %s", experiment_id)
-            except Exception as exc:
-                log.warning("Scoring/report failed: %s", exc)
+                log.error("Processing failed for %s: %r",
+                          fn["dwarf_function_id"], exc)
+                errtrack.record(dwarf_function_id=fn["dwarf_function_id"],
+                                error=str(exc))
+            finally:
+                done += 1
+                if pbar is not None:
+                    pbar.update(1)
+                elif done % 10 == 0:
+                    # Fallback: simple progress
+                    print(f"  Progress: {done}", flush=True)
+            if errtrack.tripped and not aborted:
+                _abort()
+
+    # Fast-fail: after FAIL_FAST_ERRORS failures in a row (provider
+    # outage, revoked key, ...) stop feeding work and cancel the pool;
+    # rows already produced are still posted.
+    aborted = False
+
+    def _abort() -> None:
+        nonlocal aborted
+        aborted = True
+        log.error("Aborting run after %d consecutive errors (%d total)",
+                  errtrack.consecutive, errtrack.total)
+        for t in tasks:
+            t.cancel()
+
+    writer_task = asyncio.create_task(_writer())
+    tasks = [asyncio.create_task(_producer())]
+    tasks += [asyncio.create_task(_worker()) for _ in range(n_workers)]
+    try:
+        # return_exceptions: a crashed worker must not cancel its siblings
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for t in tasks:
+            t.cancel()
+        if pbar is not None:
+            pbar.close()
+        row_q.put_nowait(None)
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            log.error("Worker crashed: %r", outcome)
+            errtrack.record(error=repr(outcome))
+
+    log.info("Fetched %d sanitized functions (%d skipped)", n_functions, skipped)
+    log.info("LLM calls complete: %d results, %d errors, %d prompt-cache hits",
+             produced, errtrack.total, result_cache.hits if result_cache else 0)
+
+    # Flush the remaining rows and wait for in-flight batch POSTs
+    await writer_task
+    log.info("Total written: %d rows", written)
+
+    # 6. Trigger scoring
+    report = None
+    if written > 0:
+        try:
+            score_resp = await _trigger_scoring(client, api_base, experiment_id)
+            if log.isEnabledFor(logging.INFO):
+                log.info("Scoring: %s", _dumps_bytes(score_resp)[:300].decode(errors="replace"))
+
+            report_resp = await _fetch_report(client, api_base, experiment_id)
+            report = report_resp
+            log.info("Report generated for %s", experiment_id)
+        except Exception as exc:
+            log.warning("Scoring/report failed: %s", exc)
 
     summary = {
         "experiment_id": experiment_id,
         "run_id": run_id,
-        "total": len(functions),
+        "total": n_functions,
         "completed": len(completed_ids) + written,
         "skipped": skipped,
         "new": written,
-        "errors": len(errors),
-        "error_details": errors if errors else None,
+        "errors": errtrack.total,
+        "error_details": errtrack.details(),
+        "aborted": aborted,
         "dry_run": False,
         "report": report,
     }
 
-    log.info("=== Run complete: %s ===", json.dumps({
-        k: v for k, v in summary.items() if k != "report"
-    }))
+    if log.isEnabledFor(logging.INFO):
+        log.info("=== Run complete: %s ===", _dumps_bytes({
+            k: v for k, v in summary.items() if k != "report"
+        }).decode())
 
     return summary
 
 
 # ─── CLI ──────────────────────────────────────────────────────────────────────
 
+def _run(coro: Any) -> Any:
+    """``asyncio.run`` on the uvloop event loop when ``uvloop`` is installed."""
+    try:
+        import uvloop  # type: ignore[import-not-found]
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 def main() -> None:
     """CLI entry point."""
     parser = argparse.ArgumentParser(
         description="Run an LLM experiment against the Reforge API",
+        epilog="The experiment's 'limit' caps how many functions are run; "
+               "limit <= 0 runs every matching function, fetched from "
+               f"/llm/functions in pages of {FUNCTIONS_PAGE_SIZE} (before paging, "
+               "0 meant a single request capped at the API's 5000 rows).",
     )
     parser.add_argument("--experiment", required=True, help="Experiment ID")
     parser.add_argument("--api-base", default="http://localhost:8080", help="API base URL")
     parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Cap for adaptive concurrency (default: 4x --concurrency)")
+    parser.add_argument("--rpm", type=int, default=None,
+                        help="Requests-per-minute budget (default: experiment config)")
+    parser.add_argument("--tpm", type=int, default=None,
+                        help="Tokens-per-minute budget (default: experiment config)")
     parser.add_argument("--run-id", default=None, help="Custom run ID (auto-generated if omitted)")
     parser.add_argument("--dry-run", action="store_true", help="Validate setup without calling LLM")
+    parser.add_argument("--store-prompt-text", action="store_true",
+                        help="Store full prompts in result rows (default: SHA-256 only)")
+    parser.add_argument("--max-response-chars", type=int, default=None,
+                        help="Truncate stored responses to this length "
+                             f"(e.g. {MAX_RESPONSE_CHARS}; default: no cap)")
     parser.add_argument("--verbose", "-v", action="store_true")
     args = parser.parse_args()
 
@@ -530,13 +978,24 @@ def main() -> None:
         format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
     )
 
-    summary = asyncio.run(run_experiment(
-        args.experiment,
-        api_base=args.api_base,
-        concurrency=args.concurrency,
-        run_id=args.run_id,
-        dry_run=args.dry_run,
-    ))
+    async def _main() -> Dict[str, Any]:
+        try:
+            return await run_experiment(
+                args.experiment,
+                api_base=args.api_base,
+                concurrency=args.concurrency,
+                max_concurrency=args.max_concurrency,
+                rpm=args.rpm,
+                tpm=args.tpm,
+                run_id=args.run_id,
+                dry_run=args.dry_run,
+                store_prompt_text=args.store_prompt_text,
+                max_response_chars=args.max_response_chars,
+            )
+        finally:
+            await close_clients()
+
+    summary = _run(_main())
 
     print("\n" + "=" * 60)
     print("SUMMARY")
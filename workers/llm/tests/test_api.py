@@ -0,0 +1,211 @@
+"""
+Tests for the API endpoints the runner talks to.
+
+Routers are mounted on a bare FastAPI app and driven through
+``httpx.ASGITransport`` (or their handlers called directly) against
+artefacts written to a temp dir.
+"""
+import asyncio
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from workers.llm import runner
+
+
+def _write_jsonl(path: Path, rows: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# /llm/functions
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def llm_data(tmp_path, monkeypatch):
+    """llm_data router over two test cases of 7 GOLD functions each.
+
+    Returns the router module and the list of test cases it has loaded.
+    """
+    from data import paths
+    from app.routers import llm_data
+
+    for tc in ("t01", "t02"):
+        _write_jsonl(
+            paths.joined_functions_path(tmp_path, tc, "O0", "stripped"),
+            [
+                {
+                    "dwarf_function_id": f"{tc}_f{i}",
+                    "ghidra_func_id": f"{tc}_g{i}",
+                    "confidence_tier": "GOLD",
+                }
+                for i in range(7)
+            ],
+        )
+        _write_jsonl(
+            paths.ghidra_functions_path(tmp_path, tc, "O0", "stripped"),
+            [{"function_id": f"{tc}_g{i}", "c_raw": "int f(void);"} for i in range(7)],
+        )
+
+    monkeypatch.setattr(llm_data, "SYNTHETIC_ROOT", tmp_path)
+    monkeypatch.setattr(llm_data, "_listing_cache", {})
+    loads: List[str] = []
+    real_load = llm_data.load_functions_with_decompiled
+
+    def counting_load(test_case, *args, **kwargs):
+        loads.append(test_case)
+        return real_load(test_case, *args, **kwargs)
+
+    monkeypatch.setattr(llm_data, "load_functions_with_decompiled", counting_load)
+    return llm_data, loads
+
+
+def _list_functions(router, *, page_size: int) -> List[str]:
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(router.router, prefix="/llm")
+
+    async def main() -> List[str]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [
+                fn["dwarf_function_id"]
+                async for fn in runner._iter_functions(
+                    client, "http://api",
+                    opt="O0", tier="GOLD", metadata_mode="STRICT",
+                    limit=0, page_size=page_size,
+                )
+            ]
+
+    return asyncio.run(main())
+
+
+class TestListFunctions:
+    def test_pages_share_one_corpus_load(self, llm_data):
+        router, loads = llm_data
+        ids = _list_functions(router, page_size=3)
+
+        assert ids == [f"{tc}_f{i}" for tc in ("t01", "t02") for i in range(7)]
+        # 5 pages, but each test case is joined once
+        assert sorted(loads) == ["t01", "t02"]
+
+    def test_rebuilt_artefacts_are_reloaded(self, llm_data, tmp_path):
+        from data import paths
+
+        router, loads = llm_data
+        _list_functions(router, page_size=5)
+        joined = paths.joined_functions_path(tmp_path, "t02", "O0", "stripped")
+        st = joined.stat()
+        os.utime(joined, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        _list_functions(router, page_size=5)
+
+        assert sorted(loads) == ["t01", "t01", "t02", "t02"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# gzip request bodies
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _post_gzip(body: bytes) -> httpx.Response:
+    from fastapi import APIRouter, FastAPI
+
+    from app.routers.results import _GzipRoute
+
+    router = APIRouter(route_class=_GzipRoute)
+
+    @router.post("/results/batch")
+    async def batch(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"rows_written": len(rows), "rows_skipped": 0}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.post(
+                "http://api/results/batch",
+                content=body,
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+
+    return asyncio.run(main())
+
+
+class TestGzipRoute:
+    def test_valid_body_is_decoded(self):
+        resp = _post_gzip(gzip.compress(b'[{"a": 1}, {"a": 2}]'))
+
+        assert resp.status_code == 200
+        assert resp.json()["rows_written"] == 2
+
+    @pytest.mark.parametrize("body", [
+        b"not gzip at all",
+        gzip.compress(b'[{"a": 1}]')[:-6],  # truncated trailer
+        gzip.compress(b'[{"a": 1}]')[:12] + b"\xff" * 8,  # corrupt deflate
+    ], ids=["not-gzip", "truncated", "corrupt"])
+    def test_bad_body_is_400(self, body):
+        resp = _post_gzip(body)
+
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "invalid gzip body"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POST /results/{experiment_id}/repair
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TOPK_JSON = '{"predictions": [{"name": "sum_array", "confidence": 0.9}]}'
+
+
+class TestRepairResults:
+    def _repair(self, tmp_path, monkeypatch, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        from app.routers import results
+
+        monkeypatch.setattr(results, "RESULTS_ROOT", tmp_path)
+        path = results._results_path("exp")
+        _write_jsonl(path, rows)
+        asyncio.run(results.repair_results("exp"))
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_raw_json_name_repaired_despite_predictions(self, tmp_path, monkeypatch):
+        """metadata["predictions"] does not protect a raw-JSON predicted_name."""
+        [row] = self._repair(tmp_path, monkeypatch, [{
+            "response_text": TOPK_JSON,
+            "predicted_name": TOPK_JSON,
+            "metadata": {"predictions": [], "metadata_mode": "STRICT"},
+        }])
+
+        assert row["predicted_name"] == "sum_array"
+        assert row["metadata"]["predictions"][0]["name"] == "sum_array"
+        assert row["metadata"]["metadata_mode"] == "STRICT"
+
+    def test_fenced_name_repaired(self, tmp_path, monkeypatch):
+        fenced = f"```json\n{TOPK_JSON}\n```"
+        [row] = self._repair(tmp_path, monkeypatch, [{
+            "response_text": fenced, "predicted_name": fenced,
+        }])
+
+        assert row["predicted_name"] == "sum_array"
+
+    def test_clean_and_truncated_rows_untouched(self, tmp_path, monkeypatch):
+        rows = [
+            {
+                "response_text": TOPK_JSON,
+                "predicted_name": "already_clean",
+                "metadata": {"predictions": [{"name": "already_clean"}]},
+            },
+            {
+                "response_text": TOPK_JSON[:20],
+                "predicted_name": TOPK_JSON[:20],
+                "metadata": {"response_truncated_from": len(TOPK_JSON)},
+            },
+        ]
+        assert self._repair(tmp_path, monkeypatch, rows) == rows
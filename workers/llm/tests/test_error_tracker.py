@@ -0,0 +1,58 @@
+"""
+Tests for bounded run-error bookkeeping.
+"""
+from workers.llm.error_tracker import ErrorTracker
+
+
+def _fill(tracker: ErrorTracker, n: int) -> None:
+    for i in range(n):
+        tracker.record(dwarf_function_id=f"f{i}", error="boom")
+
+
+class TestRecord:
+    def test_no_errors(self):
+        tracker = ErrorTracker()
+        assert tracker.total == 0
+        assert tracker.details() is None
+
+    def test_keeps_everything_under_cap(self):
+        tracker = ErrorTracker(max_samples=5)
+        _fill(tracker, 3)
+        assert len(tracker) == 3
+        assert [d["dwarf_function_id"] for d in tracker.details()] == ["f0", "f1", "f2"]
+
+    def test_bounded_samples_plus_tail(self):
+        tracker = ErrorTracker(max_samples=3, last_n=2)
+        _fill(tracker, 1000)
+        assert tracker.total == 1000
+        assert len(tracker.samples) == 3
+        ids = [d["dwarf_function_id"] for d in tracker.details()]
+        assert ids == ["f0", "f1", "f2", "f998", "f999"]
+
+    def test_tail_not_duplicated_when_barely_over_cap(self):
+        tracker = ErrorTracker(max_samples=3, last_n=10)
+        _fill(tracker, 4)
+        ids = [d["dwarf_function_id"] for d in tracker.details()]
+        assert ids == ["f0", "f1", "f2", "f3"]
+
+
+class TestTripped:
+    def test_disabled_by_default(self):
+        tracker = ErrorTracker()
+        _fill(tracker, 500)
+        assert not tracker.tripped
+
+    def test_trips_on_consecutive_errors(self):
+        tracker = ErrorTracker(fail_after=3)
+        _fill(tracker, 2)
+        assert not tracker.tripped
+        _fill(tracker, 1)
+        assert tracker.tripped
+
+    def test_success_resets_streak(self):
+        tracker = ErrorTracker(fail_after=3)
+        _fill(tracker, 2)
+        tracker.record_success()
+        _fill(tracker, 2)
+        assert not tracker.tripped
+        assert tracker.total == 4
@@ -0,0 +1,31 @@
+"""
+Tests for prompt template rendering.
+"""
+from workers.llm.prompt import load_template, render_prompt
+
+TEMPLATE = "Code:\n{{ c_raw }}\nCalls: {{ calls }}\nCFG: {{ cfg_summary }}\nVars: {{ variables }}\n"
+
+
+class TestRenderPrompt:
+    def test_substitutes_all_placeholders(self):
+        out = render_prompt(TEMPLATE, "int f(void);", calls="g()",
+                            cfg_summary="1 block", variables="int x")
+        assert out == "Code:\nint f(void);\nCalls: g()\nCFG: 1 block\nVars: int x\n"
+
+    def test_missing_context_gets_default_text(self):
+        out = render_prompt(TEMPLATE, "int f(void);")
+        assert "Calls: (no call data available)" in out
+        assert "CFG: (no CFG data available)" in out
+        assert "Vars: (no variable data available)" in out
+
+    def test_placeholder_text_in_code_is_not_substituted(self):
+        out = render_prompt(TEMPLATE, "/* {{ calls }} */", calls="g()")
+        assert "Code:\n/* {{ calls }} */\n" in out
+
+    def test_repeated_placeholder(self):
+        assert render_prompt("{{ c_raw }}|{{ c_raw }}", "x") == "x|x"
+
+    def test_bundled_templates_render_completely(self):
+        for template_id in ("function_naming_v2_L0", "function_naming_topk_L2"):
+            out = render_prompt(load_template(template_id), "int f(void);")
+            assert "{{" not in out
@@ -0,0 +1,106 @@
+"""
+Tests for the adaptive concurrency limiter.
+"""
+import asyncio
+
+import httpx
+
+from workers.llm.rate_limit import (
+    AdaptiveLimiter,
+    TokenBucket,
+    backoff_delay,
+    is_retryable,
+    retry_after,
+)
+
+
+def _status_error(code: int, headers=None) -> httpx.HTTPStatusError:
+    req = httpx.Request("POST", "https://example.invalid")
+    return httpx.HTTPStatusError(
+        "err", request=req,
+        response=httpx.Response(code, request=req, headers=headers),
+    )
+
+
+class TestIsRetryable:
+    def test_throttle_and_server_errors(self):
+        assert is_retryable(_status_error(429))
+        assert is_retryable(_status_error(503))
+
+    def test_client_errors_not_retried(self):
+        assert not is_retryable(_status_error(400))
+        assert not is_retryable(ValueError("boom"))
+
+
+class TestRetryAfter:
+    def test_header_honoured(self):
+        exc = _status_error(429, {"Retry-After": "7"})
+        assert retry_after(exc) == 7.0
+        assert backoff_delay(0, exc) == 7.0
+
+    def test_missing_or_date_header_falls_back(self):
+        assert retry_after(_status_error(429)) is None
+        exc = _status_error(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after(exc) is None
+        assert 0.5 <= backoff_delay(0, exc) <= 1.5
+
+
+class TestTokenBucket:
+    def test_take_within_budget_does_not_wait(self):
+        bucket = TokenBucket(600)
+
+        async def main():
+            await bucket.take(500)
+            await bucket.take(100)
+
+        asyncio.run(asyncio.wait_for(main(), timeout=0.5))
+
+    def test_take_over_budget_waits_for_refill(self):
+        bucket = TokenBucket(6000)  # 100 units / second
+        bucket.adjust(-6000)        # drain
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            await bucket.take(10)
+            return loop.time() - t0
+
+        assert asyncio.run(main()) >= 0.05
+
+    def test_refund_capped_at_capacity(self):
+        bucket = TokenBucket(100)
+        bucket.adjust(1000)
+        assert bucket._level == 100
+
+
+class TestAdaptiveLimiter:
+    def test_additive_increase(self):
+        lim = AdaptiveLimiter(2, max_limit=3, grow_every=2)
+        for _ in range(4):
+            lim.on_success()
+        assert lim.limit == 3  # capped at max_limit
+
+    def test_multiplicative_decrease(self):
+        lim = AdaptiveLimiter(8)
+        lim.on_throttle()
+        assert lim.limit == 4
+        for _ in range(5):
+            lim.on_throttle()
+        assert lim.limit == 1
+
+    def test_bounds_in_flight(self):
+        lim = AdaptiveLimiter(2)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with lim:
+                peak = max(peak, lim.in_flight)
+                await asyncio.sleep(0.001)
+
+        async def main():
+            await asyncio.gather(*(work() for _ in range(10)))
+
+        asyncio.run(main())
+        assert peak == 2
+        assert lim.in_flight == 0
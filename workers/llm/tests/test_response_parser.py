@@ -39,6 +39,10 @@ class TestCleanName:
         assert _clean_name("The function name is: parse_header") == "parse_header"
         assert _clean_name("the suggested function name should be parse_header") == "parse_header"
 
+    def test_strip_prefix_then_backticks(self):
+        assert _clean_name("The function name is: `parse_header`") == "parse_header"
+        assert _clean_name("```\nparse_header\n```") == "parse_header"
+
     def test_multiline_takes_first(self):
         assert _clean_name("parse_header\nsome explanation") == "parse_header"
 
@@ -233,22 +237,59 @@ class TestEdgeCases:
 class TestExtractHelpers:
     def test_extract_json_from_fences_json_tag(self):
         text = '```json\n{"key": "value"}\n```'
-        assert _extract_json_from_fences(text) == '{"key": "value"}'
+        start, end = _extract_json_from_fences(text)
+        assert text[start:end].strip() == '{"key": "value"}'
 
     def test_extract_json_from_fences_no_fence(self):
         assert _extract_json_from_fences("no fences here") is None
 
     def test_extract_json_object_simple(self):
         text = 'prefix {"key": "val"} suffix'
-        assert _extract_json_object(text) == '{"key": "val"}'
+        start, end = _extract_json_object(text)
+        assert text[start:end] == '{"key": "val"}'
 
     def test_extract_json_object_nested(self):
         text = '{"outer": {"inner": "val"}}'
-        assert _extract_json_object(text) == '{"outer": {"inner": "val"}}'
+        assert _extract_json_object(text) == (0, len(text))
 
     def test_extract_json_object_with_string_braces(self):
         text = '{"name": "hello {world}"}'
-        assert _extract_json_object(text) == '{"name": "hello {world}"}'
+        assert _extract_json_object(text) == (0, len(text))
+
+    def test_extract_json_object_skips_invalid_braces(self):
+        text = 'use {braces} like {"name": "x"} this'
+        start, end = _extract_json_object(text)
+        assert text[start:end] == '{"name": "x"}'
 
     def test_extract_json_object_none(self):
         assert _extract_json_object("no json here") is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JSON backends
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_BACKEND_SAMPLES = [
+    '{"predictions": [{"name": "parse_header", "confidence": 0.9}]}',
+    '```json\n{"predictions": [{"name": "a"}, {"name": "b"}]}\n```',
+    'Sure: {"name": "init_ctx", "confidence": 0.5} done',
+    '[{"name": "x"}]',
+    '{"predictions": [',
+    "just_a_name",
+]
+
+
+class TestJsonBackends:
+    """Parsing gives the same result with orjson and with stdlib json."""
+
+    @pytest.mark.parametrize("raw", _BACKEND_SAMPLES)
+    def test_orjson_matches_stdlib(self, raw, monkeypatch):
+        import json
+
+        from workers.llm import response_parser
+
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(response_parser, "_loads", orjson.loads)
+        fast = parse_topk_response(raw)
+        monkeypatch.setattr(response_parser, "_loads", json.loads)
+        assert parse_topk_response(raw) == fast
@@ -0,0 +1,77 @@
+"""
+Tests for the in-flight + LRU LLM result cache.
+"""
+import asyncio
+
+import pytest
+
+from workers.llm.result_cache import LLMResultCache
+
+
+def _key(prompt: str) -> bytes:
+    return LLMResultCache.key("m", prompt)
+
+
+class TestKey:
+    def test_depends_on_request_params(self):
+        assert _key("p") == _key("p")
+        assert _key("p") != _key("q")
+        assert LLMResultCache.key("m", "p", temperature=0.5) != _key("p")
+        assert LLMResultCache.key("m", "p", max_tokens=10) != _key("p")
+
+
+class TestGetOrCall:
+    def test_inflight_duplicates_share_one_call(self):
+        cache = LLMResultCache()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"response_text": "foo"}
+
+        async def main():
+            return await asyncio.gather(*(
+                cache.get_or_call(_key("p"), call) for _ in range(5)
+            ))
+
+        outcomes = asyncio.run(main())
+        assert calls == 1
+        assert [hit for _, hit in outcomes].count(False) == 1
+        assert cache.hits == 4
+
+    def test_completed_result_served_from_lru(self):
+        cache = LLMResultCache(maxsize=1)
+
+        async def call():
+            return {"response_text": "foo"}
+
+        async def main():
+            await cache.get_or_call(_key("a"), call)
+            hit_a = (await cache.get_or_call(_key("a"), call))[1]
+            await cache.get_or_call(_key("b"), call)  # evicts "a"
+            hit_a_again = (await cache.get_or_call(_key("a"), call))[1]
+            return hit_a, hit_a_again
+
+        assert asyncio.run(main()) == (True, False)
+
+    def test_failures_not_cached(self):
+        cache = LLMResultCache()
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("boom")
+            return {"response_text": "ok"}
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                await cache.get_or_call(_key("p"), flaky)
+            return await cache.get_or_call(_key("p"), flaky)
+
+        result, hit = asyncio.run(main())
+        assert result == {"response_text": "ok"} and hit is False
+        assert attempts == 2
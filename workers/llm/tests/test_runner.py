@@ -0,0 +1,236 @@
+"""
+Tests for the experiment runner.
+
+``run_experiment`` is driven end-to-end against an in-memory Reforge API
+and OpenRouter, both served by ``httpx.MockTransport``.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from workers.llm import runner
+from workers.llm.runner import ResultRow
+
+MODEL = "openai/gpt-4o-mini"
+
+
+def _row(i: int = 0, **overrides) -> ResultRow:
+    fields = dict(
+        experiment_id="exp", run_id="run", job_id=f"job{i}",
+        test_case="t", opt="O0", dwarf_function_id=f"f{i}",
+        ghidra_func_id=None, model="m", prompt_template_id="tpl",
+        temperature=0.0, response_text="naïve_parse", prompt_tokens=1,
+        completion_tokens=2, total_tokens=3, latency_ms=4,
+        metadata={"k": [1, None, "ü"]},
+    )
+    fields.update(overrides)
+    return ResultRow(**fields)
+
+
+class TestJsonBackends:
+    """orjson (when installed) and the stdlib fallback agree."""
+
+    def test_dumps_fallback_round_trips(self):
+        rows = [_row(0), _row(1)]
+        decoded = json.loads(runner._json_dumps_bytes(rows))
+        assert decoded[1]["job_id"] == "job1"
+        assert decoded[0]["metadata"] == {"k": [1, None, "ü"]}
+
+    def test_orjson_matches_fallback(self):
+        orjson = pytest.importorskip("orjson")
+        rows = [_row(0), _row(1, predicted_name="p")]
+        assert orjson.loads(orjson.dumps(rows)) == json.loads(
+            runner._json_dumps_bytes(rows)
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# run_experiment against mocked services
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class FakeAPI:
+    """Reforge API: experiment config, paged functions, batch sink."""
+
+    def __init__(self, n_functions: int) -> None:
+        self.functions = [
+            {
+                "dwarf_function_id": f"f{i}",
+                "c_raw": f"int fn_{i}(void) {{ return {i}; }}",
+                "test_case": "t",
+                "opt": "O0",
+            }
+            for i in range(n_functions)
+        ]
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    @property
+    def posted_ids(self) -> List[str]:
+        return [r["dwarf_function_id"] for b in self.batches for r in b]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/data/experiments/exp":
+            return httpx.Response(200, json={
+                "model": MODEL,
+                "prompt_template_id": "function_naming_v2_L0",
+                "temperature": 0.0,
+            })
+        if path.endswith("/completed-ids"):
+            return httpx.Response(404)
+        if path == "/llm/functions":
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            return httpx.Response(200, json=self.functions[offset:offset + limit])
+        if path == "/results/batch":
+            body = request.content
+            if request.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            rows = json.loads(body)
+            self.batches.append(rows)
+            return httpx.Response(200, json={"rows_written": len(rows), "rows_skipped": 0})
+        if path.endswith("/score") or path.endswith("/report"):
+            return httpx.Response(200, json={})
+        return httpx.Response(404)
+
+
+class FakeOpenRouter:
+    """OpenRouter: model list plus chat completions keyed by function.
+
+    Functions listed in *fail* get a 401 (not retried); *delay* maps a
+    function ID to seconds to wait before answering.
+    """
+
+    def __init__(self, fail=(), delay: Optional[Dict[str, float]] = None) -> None:
+        self.fail = set(fail)
+        self.delay = delay or {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"data": [{"id": MODEL}]})
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        func_id = "f" + re.search(r"int fn_(\d+)\(", prompt).group(1)
+        if func_id in self.fail:
+            return httpx.Response(401, json={"error": "revoked"})
+        await asyncio.sleep(self.delay.get(func_id, 0))
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": f"name_{func_id}"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+
+def _run_experiment(api: FakeAPI, llm: FakeOpenRouter, **kwargs) -> Dict[str, Any]:
+    async def main() -> Dict[str, Any]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(api)) as client, \
+                httpx.AsyncClient(transport=httpx.MockTransport(llm)) as llm_client:
+            return await runner.run_experiment(
+                "exp",
+                api_base="http://api",
+                openrouter_key="key",
+                run_id="run",
+                client=client,
+                llm_client=llm_client,
+                **kwargs,
+            )
+
+    return asyncio.run(main())
+
+
+class TestRunExperiment:
+    def test_every_row_posted_once_with_partial_final_batch(self, monkeypatch):
+        monkeypatch.setattr(runner, "BATCH_POST_SIZE", 4)
+        api = FakeAPI(10)
+        summary = _run_experiment(api, FakeOpenRouter())
+
+        assert sorted(api.posted_ids) == sorted(f"f{i}" for i in range(10))
+        assert sorted(len(b) for b in api.batches) == [2, 4, 4]
+        assert summary["new"] == 10
+        assert summary["errors"] == 0
+        assert summary["aborted"] is False
+
+    def test_timer_flushes_partial_batch(self, monkeypatch):
+        monkeypatch.setattr(runner, "BATCH_FLUSH_SECONDS", 0.02)
+        api = FakeAPI(3)
+        _run_experiment(api, FakeOpenRouter(delay={"f2": 0.3}))
+
+        # f0/f1 go out on the quiet-period flush, f2 on the final drain
+        assert [sorted(r["dwarf_function_id"] for r in b) for b in api.batches] == [
+            ["f0", "f1"], ["f2"],
+        ]
+
+    def test_fewer_functions_than_workers(self):
+        api = FakeAPI(2)
+        summary = _run_experiment(api, FakeOpenRouter(), concurrency=5)
+
+        assert sorted(api.posted_ids) == ["f0", "f1"]
+        assert summary["total"] == 2
+        assert summary["new"] == 2
+
+    def test_fast_fail_posts_produced_rows_and_aborts(self, monkeypatch):
+        monkeypatch.setattr(runner, "FAIL_FAST_ERRORS", 3)
+        api = FakeAPI(20)
+        llm = FakeOpenRouter(fail=[f"f{i}" for i in range(2, 20)])
+        summary = _run_experiment(api, llm, concurrency=1, max_concurrency=1)
+
+        assert summary["aborted"] is True
+        assert sorted(api.posted_ids) == ["f0", "f1"]
+        assert summary["new"] == 2
+        assert summary["errors"] >= 3
+
+
+class TestGzipBatches:
+    def test_large_batch_is_gzipped_and_decoded_by_route(self):
+        from fastapi import APIRouter, FastAPI, Request
+
+        from app.routers.results import _GzipRoute
+
+        router = APIRouter(route_class=_GzipRoute)
+        seen: Dict[str, Any] = {}
+
+        @router.post("/results/batch")
+        async def batch(request: Request) -> Dict[str, Any]:
+            seen["encoding"] = request.headers.get("Content-Encoding")
+            rows = json.loads(await request.body())
+            return {"rows_written": len(rows), "rows_skipped": 0}
+
+        app = FastAPI()
+        app.include_router(router)
+
+        rows = [_row(i, response_text="x" * 200) for i in range(30)]
+        assert len(runner._dumps_bytes(rows)) >= runner.GZIP_MIN_BYTES
+
+        async def main() -> Dict[str, Any]:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await runner._post_batch(client, "http://api", rows)
+
+        assert asyncio.run(main()) == {"rows_written": 30, "rows_skipped": 0}
+        assert seen["encoding"] == "gzip"
+
+
+class TestJobId:
+    @staticmethod
+    def _expected(*fields) -> str:
+        key = "|".join(str(f) for f in fields)
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+    def test_factory_matches_reference_hash(self):
+        args = ("exp", "run", "openai/gpt-4o-mini", "tpl_v1", 0.2)
+        job_id_for = runner._job_id_factory(*args)
+        for func_id in ("f0", "cu0x0:die0x2d", "ünï"):
+            expected = self._expected(
+                "exp", "run", func_id, "openai/gpt-4o-mini", "tpl_v1", 0.2,
+            )
+            assert job_id_for(func_id) == expected
+            assert runner._job_id(
+                "exp", "run", func_id, "openai/gpt-4o-mini", "tpl_v1", 0.2,
+            ) == expected
+
+    def test_known_value(self):
+        # Pinned: existing results.jsonl files are deduplicated on this ID
+        assert runner._job_id("exp", "run", "f0", "m", "tpl", 0.0) == "f876989fa7313c03"
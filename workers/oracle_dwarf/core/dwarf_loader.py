@@ -5,15 +5,25 @@ Responsibilities:
   - Open a validated ELF binary and obtain a DWARFInfo handle.
   - Iterate CUs and yield lightweight CUHandle descriptors.
   - Provide CU-scoped access to line programs and DIE trees.
+  - Map a per-CU function over every CU, optionally across worker
+    processes for large binaries.
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
 
 from elftools.elf.elffile import ELFFile
 from elftools.dwarf.dwarfinfo import DWARFInfo
 from elftools.dwarf.compileunit import CompileUnit
 
+T = TypeVar("T")
+
+# Binaries with fewer CUs than this are processed in-process: pool start-up
+# and re-opening the ELF in each worker would cost more than they save.
+PARALLEL_MIN_CUS = 64
+
 
 @dataclass
 class CUHandle:
@@ -72,28 +82,95 @@ class DwarfLoader:
     def iter_cus(self) -> Iterator[CUHandle]:
         """Yield a CUHandle for every Compilation Unit."""
         for idx, cu in enumerate(self.dwarf.iter_CUs()):
-            top_die = cu.get_top_DIE()
-            attrs = top_die.attributes
-
-            comp_dir = None
-            if "DW_AT_comp_dir" in attrs:
-                raw = attrs["DW_AT_comp_dir"].value
-                comp_dir = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
-
-            cu_name = None
-            if "DW_AT_name" in attrs:
-                raw = attrs["DW_AT_name"].value
-                cu_name = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
-
-            lang = None
-            if "DW_AT_language" in attrs:
-                lang = attrs["DW_AT_language"].value
-
-            yield CUHandle(
-                cu_offset=cu.cu_offset,
-                cu_index=idx,
-                comp_dir=comp_dir,
-                cu_name=cu_name,
-                language=lang,
-                cu=cu,
-            )
+            yield self._make_handle(cu, idx)
+
+    def get_cu(self, cu_offset: int, cu_index: int) -> CUHandle:
+        """Return the CUHandle for the CU at *cu_offset* in .debug_info.
+
+        *cu_index* is the CU's position in ``iter_cus`` order; it is
+        recorded on the handle, not used for the lookup.
+        """
+        return self._make_handle(self.dwarf.get_CU_at(cu_offset), cu_index)
+
+    def map_cus(
+        self,
+        fn: Callable[[CUHandle, DWARFInfo], T],
+        workers: Optional[int] = 1,
+    ) -> List[T]:
+        """
+        Apply ``fn(cu_handle, dwarf)`` to every CU; return results in CU order.
+
+        CUs share no state and per-CU work is pure-Python pyelftools
+        parsing, so with ``workers > 1`` a binary with at least
+        ``PARALLEL_MIN_CUS`` CUs is split into contiguous chunks handled
+        by worker processes, each opening its own DWARF handle
+        (pyelftools objects do not pickle).  *fn* must therefore be
+        picklable — a module-level function or a ``functools.partial``
+        of one.  Otherwise the CUs are processed in-process on this
+        loader.
+
+        Parameters
+        ----------
+        fn : callable
+            Per-CU function ``(CUHandle, DWARFInfo) -> T``.
+        workers : int | None
+            Worker processes.  Defaults to 1 (in-process); ``None``
+            uses ``os.cpu_count()``.
+        """
+        cus = [(idx, cu.cu_offset) for idx, cu in enumerate(self.dwarf.iter_CUs())]
+        n_workers = min(workers or os.cpu_count() or 1, len(cus))
+        if n_workers <= 1 or len(cus) < PARALLEL_MIN_CUS:
+            return [fn(cu_handle, self.dwarf) for cu_handle in self.iter_cus()]
+
+        n_chunks = n_workers * 4  # a few chunks per worker evens out CU sizes
+        size = -(-len(cus) // n_chunks)
+        chunks = [cus[i:i + size] for i in range(0, len(cus), size)]
+
+        results: List[T] = []
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for chunk_results in pool.map(
+                _map_cus_at,
+                [self._path] * len(chunks),
+                [fn] * len(chunks),
+                chunks,
+            ):
+                results.extend(chunk_results)
+        return results
+
+    def _make_handle(self, cu: CompileUnit, idx: int) -> CUHandle:
+        top_die = cu.get_top_DIE()
+        attrs = top_die.attributes
+
+        comp_dir = None
+        if "DW_AT_comp_dir" in attrs:
+            raw = attrs["DW_AT_comp_dir"].value
+            comp_dir = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
+
+        cu_name = None
+        if "DW_AT_name" in attrs:
+            raw = attrs["DW_AT_name"].value
+            cu_name = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
+
+        lang = None
+        if "DW_AT_language" in attrs:
+            lang = attrs["DW_AT_language"].value
+
+        return CUHandle(
+            cu_offset=cu.cu_offset,
+            cu_index=idx,
+            comp_dir=comp_dir,
+            cu_name=cu_name,
+            language=lang,
+            cu=cu,
+        )
+
+
+def _map_cus_at(
+    path: str,
+    fn: Callable[[CUHandle, DWARFInfo], T],
+    cus: List[Tuple[int, int]],
+) -> List[T]:
+    """Worker for :meth:`DwarfLoader.map_cus`: open *path* and apply *fn*
+    to the ``(cu_index, cu_offset)`` CUs in *cus*, in order."""
+    with DwarfLoader(path) as loader:
+        return [fn(loader.get_cu(off, idx), loader.dwarf) for idx, off in cus]
@@ -11,12 +11,14 @@ Responsibilities:
 This module intentionally does NOT parse DWARF data.
 """
 import hashlib
-from dataclasses import dataclass, field
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 
 from elftools.elf.elffile import ELFFile
-from elftools.common.exceptions import ELFError
 
 
 @dataclass(frozen=True)
@@ -46,26 +48,51 @@ class ElfMeta:
     has_split_dwarf: bool = False
 
 
-def _sha256(path: Path) -> str:
+def _sha256(f: BinaryIO) -> str:
+    """SHA-256 of the open binary file *f*, read from its current position."""
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+: read loop in C
+        return hashlib.file_digest(f, "sha256").hexdigest()
     h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
+    for chunk in iter(lambda: f.read(1 << 20), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+_HASH_CHUNK = 1 << 20
+
+
+def _sha256_fd(fd: int, size: int, cancel: threading.Event) -> Optional[str]:
+    """SHA-256 of the first *size* bytes of *fd*, read with ``os.pread``.
+
+    pread leaves the shared file position alone, so the caller can parse
+    the same handle meanwhile.  Returns None once *cancel* is set.
+    """
+    h = hashlib.sha256()
+    offset = 0
+    while offset < size:
+        if cancel.is_set():
+            return None
+        chunk = os.pread(fd, min(_HASH_CHUNK, size - offset), offset)
+        if not chunk:
+            break
+        h.update(chunk)
+        offset += len(chunk)
     return h.hexdigest()
 
 
 def _read_build_id(elffile: ELFFile) -> Optional[str]:
     """Read GNU build-id from .note.gnu.build-id section."""
-    for section in elffile.iter_sections():
-        if section.name == ".note.gnu.build-id":
-            # The note section has a data payload; build-id is the desc field
-            # of the first NT_GNU_BUILD_ID note.
-            try:
-                for note in section.iter_notes():
-                    if note["n_type"] == "NT_GNU_BUILD_ID":
-                        return note["n_desc"]
-            except Exception:
-                pass
+    section = elffile.get_section_by_name(".note.gnu.build-id")
+    if section is None:
+        return None
+    # The note section has a data payload; build-id is the desc field
+    # of the first NT_GNU_BUILD_ID note.
+    try:
+        for note in section.iter_notes():
+            if note["n_type"] == "NT_GNU_BUILD_ID":
+                return note["n_desc"]
+    except Exception:
+        pass
     return None
 
 
@@ -84,35 +111,60 @@ def read_elf(path: str) -> ElfMeta:
     if not p.exists():
         raise FileNotFoundError(f"Binary not found: {path}")
 
-    file_sha256 = _sha256(p)
-    file_size = p.stat().st_size
-
     with open(p, "rb") as f:
-        try:
-            elffile = ELFFile(f)
-        except ELFError:
-            raise
+        fd = f.fileno()
+        file_size = os.fstat(fd).st_size
+
+        if not hasattr(os, "pread"):  # Windows: hash first, then parse
+            file_sha256 = _sha256(f)
+            f.seek(0)
+            return _parse_elf(p, f, file_sha256, file_size)
+
+        # Hash the same descriptor on a worker thread while the header and
+        # section table are parsed here: hashlib releases the GIL, so the
+        # two overlap, and sha256 and size both describe this one inode.
+        cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            hash_future = pool.submit(_sha256_fd, fd, file_size, cancel)
+            try:
+                meta = _parse_elf(p, f, "", file_size)
+            except BaseException:
+                cancel.set()  # stop hashing a file we are rejecting
+                raise
+            file_sha256 = hash_future.result()
+
+    return replace(meta, file_sha256=file_sha256)
 
-        machine = elffile.header.e_machine
-        elf_class = elffile.elfclass  # 32 or 64
-        endianness = "little" if elffile.little_endian else "big"
 
-        # Collect section names
-        section_names = [s.name for s in elffile.iter_sections()]
-        debug_sections = [n for n in section_names if n.startswith(".debug_")]
+def _parse_elf(p: Path, f: BinaryIO, file_sha256: str, file_size: int) -> ElfMeta:
+    """Build an :class:`ElfMeta` from the open binary *f*."""
+    elffile = ELFFile(f)
 
-        has_debug_info = ".debug_info" in section_names
-        has_debug_line = ".debug_line" in section_names
-        has_debug_ranges = ".debug_ranges" in section_names or ".debug_rnglists" in section_names
-        has_debug_str = ".debug_str" in section_names
+    machine = elffile.header.e_machine
+    elf_class = elffile.elfclass  # 32 or 64
+    endianness = "little" if elffile.little_endian else "big"
 
+    # Classify section names in one pass
+    debug_sections: List[str] = []
+    has_debug_info = has_debug_line = has_debug_ranges = False
+    has_debug_str = has_split_dwarf = False
+    for section in elffile.iter_sections():
+        n = section.name
+        if n.startswith(".debug_"):
+            debug_sections.append(n)
+            if n == ".debug_info":
+                has_debug_info = True
+            elif n == ".debug_line":
+                has_debug_line = True
+            elif n == ".debug_ranges" or n == ".debug_rnglists":
+                has_debug_ranges = True
+            elif n == ".debug_str":
+                has_debug_str = True
         # Split-DWARF: presence of .debug_info.dwo or .gnu_debugaltlink
-        has_split_dwarf = any(
-            n.endswith(".dwo") or n == ".gnu_debugaltlink"
-            for n in section_names
-        )
+        if n.endswith(".dwo") or n == ".gnu_debugaltlink":
+            has_split_dwarf = True
 
-        build_id = _read_build_id(elffile)
+    build_id = _read_build_id(elffile)
 
     return ElfMeta(
         path=str(p),
@@ -10,8 +10,9 @@ Responsibilities:
   - Assign a stable function_id: "cu<cu_offset>:die<die_offset>".
   - Extract optional DW_AT_name and DW_AT_linkage_name.
 """
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Iterator
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Iterator
 
 from elftools.dwarf.compileunit import CompileUnit
 from elftools.dwarf.die import DIE
@@ -19,9 +20,12 @@ from elftools.dwarf.dwarfinfo import DWARFInfo
 from elftools.dwarf.ranges import RangeLists
 
 
-@dataclass(frozen=True)
-class AddressRange:
-    """A half-open address range [low, high)."""
+class AddressRange(NamedTuple):
+    """A half-open address range [low, high).
+
+    A NamedTuple rather than a dataclass: large binaries produce hundreds
+    of thousands of these, and a tuple carries no per-instance ``__dict__``.
+    """
     low: int
     high: int
 
@@ -30,7 +34,7 @@ class AddressRange:
         return self.high - self.low
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionEntry:
     """A single non-library function candidate extracted from DWARF."""
 
@@ -54,17 +58,49 @@ class FunctionEntry:
     decl_missing_reason: Optional[str] = None  # why decl_file is None
 
 
-def _decode_attr(die: DIE, attr_name: str) -> Optional[str]:
-    """Decode a string attribute from a DIE, returning None if absent."""
-    if attr_name not in die.attributes:
+def _decode_attr(attrs: Dict[str, Any], attr_name: str) -> Optional[str]:
+    """Decode a string attribute from a DIE's *attrs*, returning None if absent.
+
+    Names are interned: the same symbol recurs across CUs (inline helpers,
+    template instances), so entries share one string per distinct name.
+    """
+    attr = attrs.get(attr_name)
+    if attr is None:
         return None
-    raw = die.attributes[attr_name].value
-    if isinstance(raw, bytes):
-        return raw.decode("utf-8", errors="replace")
+    raw = attr.value
+    if type(raw) is bytes:              # pyelftools' form for string attrs
+        return sys.intern(raw.decode("utf-8", errors="replace"))
     return str(raw)
 
 
-def _normalize_ranges(die: DIE, cu: CompileUnit, dwarf: DWARFInfo) -> List[AddressRange]:
+# Address-class forms: DW_AT_high_pc in one of these is an absolute address
+# (pyelftools resolves DW_FORM_addrx* through .debug_addr); any other
+# (constant-class) form is an offset from DW_AT_low_pc.
+_ADDR_FORMS = frozenset((
+    "DW_FORM_addr",
+    "DW_FORM_addrx", "DW_FORM_addrx1", "DW_FORM_addrx2",
+    "DW_FORM_addrx3", "DW_FORM_addrx4",
+))
+
+
+def _load_range_lists(dwarf: DWARFInfo) -> Optional[RangeLists]:
+    """``dwarf.range_lists()``, or None if the section cannot be parsed.
+
+    A malformed or unsupported .debug_ranges / .debug_rnglists then only
+    empties the ranges of DW_AT_ranges subprograms, as a failed per-DIE
+    lookup does, instead of failing the whole CU.
+    """
+    try:
+        return dwarf.range_lists()
+    except Exception:
+        return None
+
+
+def _normalize_ranges(
+    die: DIE,
+    cu_base: int,
+    range_lists: Optional[RangeLists],
+) -> List[AddressRange]:
     """
     Compute a list of [low, high) address ranges for a subprogram DIE.
 
@@ -72,6 +108,10 @@ def _normalize_ranges(die: DIE, cu: CompileUnit, dwarf: DWARFInfo) -> List[Addre
       1. DW_AT_low_pc + DW_AT_high_pc  (address form — high is absolute)
       2. DW_AT_low_pc + DW_AT_high_pc  (offset form — high is size)
       3. DW_AT_ranges → .debug_ranges / .debug_rnglists section
+
+    *cu_base* (the CU's DW_AT_low_pc) and *range_lists* (from
+    ``_load_range_lists``, ``None`` if unavailable) are computed once per
+    CU by the caller.
     """
     attrs = die.attributes
 
@@ -81,9 +121,9 @@ def _normalize_ranges(die: DIE, cu: CompileUnit, dwarf: DWARFInfo) -> List[Addre
 
         if "DW_AT_high_pc" in attrs:
             high_attr = attrs["DW_AT_high_pc"]
-            # DWARF v4: if form is DW_FORM_addr, high_pc is an address;
+            # DWARF v4+: an address-class form makes high_pc an address;
             # otherwise it's an offset (size) from low_pc.
-            if high_attr.form == "DW_FORM_addr":
+            if high_attr.form in _ADDR_FORMS:
                 high_pc = high_attr.value
             else:
                 high_pc = low_pc + high_attr.value
@@ -97,22 +137,16 @@ def _normalize_ranges(die: DIE, cu: CompileUnit, dwarf: DWARFInfo) -> List[Addre
 
     # ── Case 3: DW_AT_ranges ─────────────────────────────────────────
     if "DW_AT_ranges" in attrs:
+        if range_lists is None:
+            return []
         ranges_offset = attrs["DW_AT_ranges"].value
         try:
-            range_lists = dwarf.range_lists()
-            if range_lists is None:
-                return []
             entries = range_lists.get_range_list_at_offset(ranges_offset)
         except Exception:
             return []
 
-        # Each entry has begin_offset / end_offset relative to CU base.
-        # Obtain the CU base address.
-        top_die = cu.get_top_DIE()
-        cu_base = 0
-        if "DW_AT_low_pc" in top_die.attributes:
-            cu_base = top_die.attributes["DW_AT_low_pc"].value
-
+        # Each entry has begin_offset / end_offset relative to CU base
+        # (a base-address-selection entry below rebinds it).
         result: List[AddressRange] = []
         for entry in entries:
             # A base-address-selection entry has begin == max addr; skip.
@@ -158,7 +192,7 @@ def _merge_ranges(ranges: List[AddressRange]) -> List[AddressRange]:
     if len(ranges) <= 1:
         return ranges
 
-    by_low = sorted(ranges, key=lambda r: (r.low, r.high))
+    by_low = sorted(ranges)                        # tuple order: (low, high)
     merged: List[AddressRange] = [by_low[0]]
 
     for r in by_low[1:]:
@@ -174,11 +208,44 @@ def _merge_ranges(ranges: List[AddressRange]) -> List[AddressRange]:
     return merged
 
 
-def _walk_dies(die: DIE) -> Iterator[DIE]:
-    """Depth-first walk of the DIE tree."""
-    yield die
-    for child in die.iter_children():
-        yield from _walk_dies(child)
+# DIE tags whose subtrees can contain DW_TAG_subprogram: units, scopes,
+# aggregate types (C++ member functions) and function bodies (GCC nested
+# functions, possibly inside a lexical block).  Types, variables,
+# parameters, enumerators etc. never do, so the walk does not enter them.
+_CONTAINER_TAGS = frozenset({
+    "DW_TAG_compile_unit",
+    "DW_TAG_partial_unit",
+    "DW_TAG_namespace",
+    "DW_TAG_module",
+    "DW_TAG_class_type",
+    "DW_TAG_structure_type",
+    "DW_TAG_union_type",
+    "DW_TAG_subprogram",
+    "DW_TAG_lexical_block",
+})
+
+
+def _walk_dies(
+    die: DIE,
+    descend: Optional[Callable[[str], bool]] = None,
+) -> Iterator[DIE]:
+    """Depth-first (pre-order) walk of the DIE tree.
+
+    Uses an explicit stack rather than recursive ``yield from``, so deep
+    or wide CUs cost no generator frame per DIE.  Children are pushed in
+    reverse so DIEs come out in the same order as a recursive walk.
+
+    If *descend* is given, the children of a DIE are only visited when
+    ``descend(die.tag)`` is true (the DIE itself is always yielded).
+    """
+    stack = [die]
+    while stack:
+        d = stack.pop()
+        yield d
+        if d.has_children and (descend is None or descend(d.tag)):
+            children = list(d.iter_children())
+            children.reverse()
+            stack.extend(children)
 
 
 def index_functions(
@@ -199,42 +266,49 @@ def index_functions(
     top_die = cu.get_top_DIE()
     entries: List[FunctionEntry] = []
 
-    for die in _walk_dies(top_die):
+    # Shared by every DW_AT_ranges subprogram in the CU; the range lists
+    # are only loaded once a DIE actually needs them
+    cu_low_pc = top_die.attributes.get("DW_AT_low_pc")
+    cu_base = cu_low_pc.value if cu_low_pc is not None else 0
+    range_lists: Optional[RangeLists] = None
+    range_lists_loaded = False
+
+    for die in _walk_dies(top_die, _CONTAINER_TAGS.__contains__):
         if die.tag != "DW_TAG_subprogram":
             continue
 
-        is_decl = False
-        if "DW_AT_declaration" in die.attributes:
-            val = die.attributes["DW_AT_declaration"].value
-            is_decl = bool(val)
+        attrs = die.attributes  # one lookup per DIE, shared by every check
 
-        name = _decode_attr(die, "DW_AT_name")
+        decl_attr = attrs.get("DW_AT_declaration")
+        is_decl = decl_attr is not None and bool(decl_attr.value)
+
+        name = _decode_attr(attrs, "DW_AT_name")
         linkage_name = (
-            _decode_attr(die, "DW_AT_linkage_name")
-            or _decode_attr(die, "DW_AT_MIPS_linkage_name")
+            _decode_attr(attrs, "DW_AT_linkage_name")
+            or _decode_attr(attrs, "DW_AT_MIPS_linkage_name")
         )
 
-        is_external = False
-        if "DW_AT_external" in die.attributes:
-            is_external = bool(die.attributes["DW_AT_external"].value)
+        ext_attr = attrs.get("DW_AT_external")
+        is_external = ext_attr is not None and bool(ext_attr.value)
 
-        is_inlined = False
-        if "DW_AT_inline" in die.attributes:
-            is_inlined = True
+        is_inlined = "DW_AT_inline" in attrs
 
-        decl_line = None
-        if "DW_AT_decl_line" in die.attributes:
-            decl_line = die.attributes["DW_AT_decl_line"].value
+        decl_line_attr = attrs.get("DW_AT_decl_line")
+        decl_line = decl_line_attr.value if decl_line_attr is not None else None
 
-        decl_column = None
-        if "DW_AT_decl_column" in die.attributes:
-            decl_column = die.attributes["DW_AT_decl_column"].value
+        decl_column_attr = attrs.get("DW_AT_decl_column")
+        decl_column = decl_column_attr.value if decl_column_attr is not None else None
 
-        decl_file_index = None
-        if "DW_AT_decl_file" in die.attributes:
-            decl_file_index = die.attributes["DW_AT_decl_file"].value
+        decl_file_attr = attrs.get("DW_AT_decl_file")
+        decl_file_index = decl_file_attr.value if decl_file_attr is not None else None
 
-        ranges = _normalize_ranges(die, cu, dwarf) if not is_decl else []
+        if is_decl:
+            ranges = []
+        else:
+            if not range_lists_loaded and "DW_AT_ranges" in attrs:
+                range_lists = _load_range_lists(dwarf)
+                range_lists_loaded = True
+            ranges = _normalize_ranges(die, cu_base, range_lists)
 
         fid = f"cu{cu_offset:#x}:die{die.offset:#x}"
 
@@ -12,21 +12,25 @@ Responsibilities:
   - Resolve file indices to paths using the line program header file_entry
     list, adjusting for DWARF v4 (1-based) vs v5 (0-based) indexing.
 """
-from collections import Counter
+import sys
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from pathlib import PurePosixPath
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from elftools.dwarf.compileunit import CompileUnit
 from elftools.dwarf.dwarfinfo import DWARFInfo
 from elftools.dwarf.lineprogram import LineProgram
 
-from oracle_dwarf.core.function_index import AddressRange
+from oracle_dwarf.core.function_index import AddressRange, _merge_ranges
 
 
-@dataclass(frozen=True)
-class LineRow:
-    """A single row from the line-number state machine."""
+class LineRow(NamedTuple):
+    """A single row from the line-number state machine.
+
+    A NamedTuple like ``AddressRange``: a CU can hold 100k+ rows, and a
+    tuple carries no per-instance ``__dict__``.
+    """
     address: int
     file_index: int
     line: int
@@ -74,12 +78,7 @@ def _build_line_table(line_program: LineProgram) -> List[LineRow]:
         # treated as real source locations.
         if state.end_sequence:
             continue
-        rows.append(LineRow(
-            address=state.address,
-            file_index=state.file,
-            line=state.line,
-            is_stmt=state.is_stmt,
-        ))
+        rows.append(LineRow(state.address, state.file, state.line, state.is_stmt))
     return rows
 
 
@@ -186,12 +185,34 @@ def resolve_file_index(
     return result
 
 
-def _in_ranges(address: int, ranges: List[AddressRange]) -> bool:
-    """Check whether *address* falls inside any of the [low, high) ranges."""
-    for r in ranges:
-        if r.low <= address < r.high:
-            return True
-    return False
+def build_file_table(
+    cu: "CompileUnit",
+    dwarf: "DWARFInfo",
+    comp_dir: Optional[str],
+) -> Dict[int, str]:
+    """Resolve every file index of the CU's line program once.
+
+    Returns ``{file_index: path}`` with the same paths (and the same
+    index base, v4 1-based / v5 0-based) as :func:`resolve_file_index`,
+    interned so the many functions declared in one header share a
+    single string.  Empty if the CU has no line program or file table.
+    """
+    line_program = dwarf.line_program_for_CU(cu)
+    if line_program is None:
+        return {}
+
+    header = line_program.header
+    version = header.get("version", 4)
+    file_entries = header.get("file_entry", [])
+    include_dirs = header.get("include_directory", [])
+
+    base = 0 if version >= 5 else 1
+    return {
+        i: sys.intern(
+            _resolve_file_impl(i, version, file_entries, include_dirs, comp_dir)
+        )
+        for i in range(base, base + len(file_entries))
+    }
 
 
 def build_cu_line_table(
@@ -213,12 +234,35 @@ def build_cu_line_table(
     return rows if rows else None
 
 
+class RowIndex(NamedTuple):
+    """A CU's line rows ordered by address, for clipping to a function.
+
+    ``order[k]`` is the position in the line table of the row with the
+    k-th smallest address, ``addresses[k]`` its address.
+    """
+    addresses: List[int]
+    order: List[int]
+
+
+def build_row_index(line_table: List[LineRow]) -> RowIndex:
+    """Sort a CU's *line_table* by address once (public API for caching).
+
+    Pass the result to ``compute_line_span`` together with the same
+    *line_table* so each function scans only the rows inside its
+    address envelope instead of the whole CU.
+    """
+    order = sorted(range(len(line_table)), key=lambda i: line_table[i].address)
+    return RowIndex([line_table[i].address for i in order], order)
+
+
 def compute_line_span(
     cu: CompileUnit,
     dwarf: DWARFInfo,
     comp_dir: Optional[str],
     ranges: List[AddressRange],
     line_table: Optional[List[LineRow]] = None,
+    row_index: Optional[RowIndex] = None,
+    file_table: Optional[Dict[int, str]] = None,
 ) -> LineSpan:
     """
     Given a function's address *ranges* and its parent CU,
@@ -231,6 +275,14 @@ def compute_line_span(
         provided the expensive state-machine replay is skipped.
         Pass ``None`` (default) to build internally — preserving
         backward compatibility.
+    row_index : RowIndex, optional
+        Address index of *line_table* (from ``build_row_index``).  When
+        provided only the rows within the function's address envelope
+        are visited.  Ignored without *line_table*.
+    file_table : dict[int, str], optional
+        The CU's resolved file paths (from ``build_file_table``).  When
+        provided, row file indices are looked up there instead of being
+        resolved per call; indices missing from it are still resolved.
     """
     if not ranges:
         return LineSpan()
@@ -243,29 +295,68 @@ def compute_line_span(
     if not rows:
         return LineSpan()
 
-    # Collect rows that fall inside the function ranges
-    matched: List[Tuple[str, int]] = []  # (file_path, line)
-    for row in rows:
-        if _in_ranges(row.address, ranges):
-            path = _resolve_file(row.file_index, line_program, comp_dir)
-            matched.append((path, row.line))
+    # One pass over the rows inside the function ranges: per-file and
+    # per-(file, line) counts plus per-file line bounds, without
+    # materialising the matched rows.
+    file_counts: Dict[str, int] = {}
+    line_row_counts: Dict[Tuple[str, int], int] = {}
+    line_bounds: Dict[str, List[int]] = {}   # path -> [min, max]
+    file_paths: Dict[int, str] = {}          # file_index -> resolved path
+
+    # Sorted, disjoint ranges: each row is tested with one binary search
+    # (merging also keeps overlapping input from double-counting a row)
+    merged = _merge_ranges(list(ranges))
+    lows = [r.low for r in merged]
+    highs = [r.high for r in merged]
+    addr_lo, addr_hi = lows[0], highs[-1]   # envelope of all the ranges
+
+    if row_index is not None and line_table is not None:
+        # Clip to the envelope by binary search; visiting the slice in
+        # line-table order keeps counts (and dominant-file ties) as for
+        # a full scan
+        lo = bisect_left(row_index.addresses, addr_lo)
+        hi = bisect_left(row_index.addresses, addr_hi, lo)
+        rows = [rows[i] for i in sorted(row_index.order[lo:hi])]
 
-    if not matched:
+    for row in rows:
+        address = row.address
+        # Most of a CU's rows belong to other functions: one compare each
+        if address < addr_lo or address >= addr_hi:
+            continue
+        if address >= highs[bisect_right(lows, address) - 1]:
+            continue
+        path = file_paths.get(row.file_index)
+        if path is None:
+            if file_table is not None:
+                path = file_table.get(row.file_index)
+            if path is None:
+                path = sys.intern(
+                    _resolve_file(row.file_index, line_program, comp_dir)
+                )
+            file_paths[row.file_index] = path
+        line = row.line
+        file_counts[path] = file_counts.get(path, 0) + 1
+        key = (path, line)
+        line_row_counts[key] = line_row_counts.get(key, 0) + 1
+        bounds = line_bounds.get(path)
+        if bounds is None:
+            line_bounds[path] = [line, line]
+        elif line < bounds[0]:
+            bounds[0] = line
+        elif line > bounds[1]:
+            bounds[1] = line
+
+    if not file_counts:
         return LineSpan(n_line_rows=0)
 
-    # Count rows per file
-    file_counts: Counter = Counter(path for path, _ in matched)
-    dominant_file, dominant_count = file_counts.most_common(1)[0]
-    total = len(matched)
+    # Dominant file: highest row count, ties to the first file seen
+    dominant_file = max(file_counts, key=file_counts.__getitem__)
+    dominant_count = file_counts[dominant_file]
+    total = sum(file_counts.values())
     ratio = dominant_count / total if total > 0 else 0.0
 
     # Line span within the dominant file
-    dominant_lines = [line for path, line in matched if path == dominant_file]
-    line_min = min(dominant_lines)
-    line_max = max(dominant_lines)
-
-    # Per-(file, line) multiset — preserves granular evidence for join
-    line_row_counts: Counter = Counter(matched)
+    line_min, line_max = line_bounds[dominant_file]
 
     return LineSpan(
         dominant_file=dominant_file,
@@ -273,6 +364,6 @@ def compute_line_span(
         line_min=line_min,
         line_max=line_max,
         n_line_rows=total,
-        file_row_counts=dict(file_counts),
-        line_rows=dict(line_row_counts),
+        file_row_counts=file_counts,
+        line_rows=line_row_counts,
     )
@@ -7,7 +7,13 @@ Two outputs per binary:
 
 Runtime contract fields (present in every output):
   package_name, oracle_version, profile_id, schema_version.
+
+The per-row leaf types (RangeModel, LineRowEntry) are slotted stdlib
+dataclasses: pydantic still validates and serializes them as fields, but
+they are cheaper to build and far smaller than BaseModel instances, and
+a binary can carry hundreds of thousands of them.
 """
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
@@ -18,14 +24,16 @@ from oracle_dwarf import ORACLE_VERSION, PACKAGE_NAME, SCHEMA_VERSION
 
 # ── Shared range model ───────────────────────────────────────────────────────
 
-class RangeModel(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RangeModel:
     low: str   # hex string for stable JSON serialization
     high: str
 
 
 # ── Per-function entry ───────────────────────────────────────────────────────
 
-class LineRowEntry(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LineRowEntry:
     """A single (file, line) hit count from DWARF .debug_line evidence."""
     file: str
     line: int
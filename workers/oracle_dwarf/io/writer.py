@@ -7,9 +7,38 @@ Filesystem layout per binary:
 """
 import json
 from pathlib import Path
+from typing import Any
 
 from oracle_dwarf.io.schema import OracleFunctionsOutput, OracleReport
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write *obj* as 2-space-indented, key-sorted JSON plus a newline.
+
+    Uses orjson when available (encodes straight to bytes, same layout);
+    otherwise streams ``json.dump`` into the file instead of building the
+    whole document as one string first.  Both write non-ASCII text as
+    raw UTF-8, so the output bytes do not depend on which path ran.
+    """
+    if orjson is not None:
+        path.write_bytes(
+            orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_SORT_KEYS
+                | orjson.OPT_APPEND_NEWLINE,
+            )
+        )
+        return
+    with path.open("w", encoding="utf-8") as fp:
+        json.dump(obj, fp, indent=2, sort_keys=True, ensure_ascii=False)
+        fp.write("\n")
+
 
 def write_outputs(
     report: OracleReport,
@@ -24,25 +53,9 @@ def write_outputs(
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    report_path = output_dir / "oracle_report.json"
-    funcs_path = output_dir / "oracle_functions.json"
-
-    report_path.write_text(
-        json.dumps(
-            report.model_dump(mode="json"),
-            indent=2,
-            sort_keys=True,
-        )
-        + "\n"
-    )
-
-    funcs_path.write_text(
-        json.dumps(
-            functions.model_dump(mode="json"),
-            indent=2,
-            sort_keys=True,
-        )
-        + "\n"
+    _write_json(output_dir / "oracle_report.json", report.model_dump(mode="json"))
+    _write_json(
+        output_dir / "oracle_functions.json", functions.model_dump(mode="json")
     )
 
     return output_dir
@@ -6,24 +6,26 @@ into a single ``run_oracle`` function that can be called from the
 API endpoint or from a CLI.
 """
 import logging
+from functools import partial
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, Tuple
+
+from elftools.dwarf.dwarfinfo import DWARFInfo
 
 from oracle_dwarf.core.elf_reader import ElfMeta, read_elf
-from oracle_dwarf.core.dwarf_loader import DwarfLoader
+from oracle_dwarf.core.dwarf_loader import CUHandle, DwarfLoader
 from oracle_dwarf.core.function_index import index_functions
 from oracle_dwarf.core.line_mapper import (
     build_cu_line_table,
+    build_file_table,
+    build_row_index,
     compute_line_span,
-    resolve_file_index,
 )
 from oracle_dwarf.io.schema import (
     FunctionCounts,
-    LineRowEntry,
     OracleFunctionEntry,
     OracleFunctionsOutput,
     OracleReport,
-    RangeModel,
 )
 from oracle_dwarf.io.writer import write_outputs
 from oracle_dwarf.policy.profile import Profile
@@ -37,10 +39,106 @@ from oracle_dwarf.policy.verdict import (
 logger = logging.getLogger(__name__)
 
 
+# ── Per-CU processing ────────────────────────────────────────────────────────
+
+def _process_cu(
+    cu_handle: CUHandle,
+    dwarf: DWARFInfo,
+    profile: Profile,
+) -> List[OracleFunctionEntry]:
+    """Index one CU's functions, compute their line spans and judge them."""
+    raw_funcs = index_functions(cu_handle.cu, cu_handle.cu_offset, dwarf)
+
+    # Build the CU line table once and share it across all
+    # functions in this CU.  Avoids replaying the DWARF line
+    # state machine N times (once per function).
+    cu_line_table = build_cu_line_table(cu_handle.cu, dwarf)
+    # ...and sort it by address once, so each function only
+    # visits the rows inside its own address envelope
+    cu_row_index = build_row_index(cu_line_table) if cu_line_table else None
+    # Likewise resolve the CU's file table once, for both line
+    # rows and decl_file
+    cu_file_table = build_file_table(cu_handle.cu, dwarf, cu_handle.comp_dir)
+
+    cu_id = f"cu{cu_handle.cu_offset:#x}"
+    entries: List[OracleFunctionEntry] = []
+
+    for fe in raw_funcs:
+        # compute line span
+        span = compute_line_span(
+            cu_handle.cu,
+            dwarf,
+            cu_handle.comp_dir,
+            fe.ranges,
+            line_table=cu_line_table,
+            row_index=cu_row_index,
+            file_table=cu_file_table,
+        )
+
+        # apply policy
+        fv, freasons = judge_function(fe, span, profile)
+
+        # Build line_rows for ACCEPT/WARN (v0.2).
+        # REJECT functions have no ranges so line_rows stays empty.
+        # Rows and ranges go in as plain dicts: pydantic-core
+        # validates them in the single OracleFunctionEntry pass,
+        # which is cheaper than constructing each model here.
+        func_line_rows: list[dict] = []
+        func_file_row_counts: dict[str, int] = {}
+        if fv in (Verdict.ACCEPT, Verdict.WARN):
+            # (file, line) keys are unique, so sorting the items
+            # orders by key alone; entries are built in order
+            func_line_rows = [
+                {"file": f, "line": l, "count": c}
+                for (f, l), c in sorted(span.line_rows.items())
+            ]
+            func_file_row_counts = dict(sorted(span.file_row_counts.items()))
+
+        # Resolve decl_file from index (v0.3)
+        resolved_decl_file = None
+        decl_missing_reason = None
+        if fe.decl_file_index is not None:
+            resolved_decl_file = cu_file_table.get(fe.decl_file_index)
+            if resolved_decl_file is None:
+                decl_missing_reason = "FILE_INDEX_UNRESOLVABLE"
+        else:
+            decl_missing_reason = "NO_DECL_FILE_ATTR"
+
+        entries.append(OracleFunctionEntry(
+            function_id=fe.function_id,
+            die_offset=hex(fe.die_offset),
+            cu_offset=hex(fe.cu_offset),
+            name=fe.name,
+            linkage_name=fe.linkage_name,
+            decl_file=resolved_decl_file,
+            decl_line=fe.decl_line,
+            decl_column=fe.decl_column,
+            comp_dir=cu_handle.comp_dir,
+            cu_id=cu_id,
+            decl_missing_reason=decl_missing_reason,
+            ranges=[
+                {"low": hex(r.low), "high": hex(r.high)}
+                for r in fe.ranges
+            ],
+            dominant_file=span.dominant_file,
+            dominant_file_ratio=span.dominant_file_ratio,
+            line_min=span.line_min,
+            line_max=span.line_max,
+            n_line_rows=span.n_line_rows,
+            line_rows=func_line_rows,
+            file_row_counts=func_file_row_counts,
+            verdict=fv.value,
+            reasons=freasons,
+        ))
+
+    return entries
+
+
 def run_oracle(
     binary_path: str,
     profile: Profile | None = None,
     output_dir: Path | None = None,
+    workers: Optional[int] = 1,
 ) -> Tuple[OracleReport, OracleFunctionsOutput]:
     """
     Run the DWARF oracle on a single binary.
@@ -54,6 +152,12 @@ def run_oracle(
     output_dir : Path, optional
         Directory to write JSON outputs.  If None, outputs are not
         written to disk (useful for API responses).
+    workers : int, optional
+        Worker processes for binaries with at least ``PARALLEL_MIN_CUS``
+        CUs (see ``DwarfLoader.map_cus``).  Defaults to 1, i.e. all CUs
+        in-process: the API endpoint calls ``run_oracle`` on the request
+        path and must not start a process pool.  ``None`` uses
+        ``os.cpu_count()``.
 
     Returns
     -------
@@ -105,104 +209,11 @@ def run_oracle(
         return report, functions
 
     # ── Step 3: extract functions + line spans ───────────────────────
-    func_entries: list[OracleFunctionEntry] = []
-    counts = FunctionCounts()
 
     try:
         with DwarfLoader(binary_path) as loader:
-            for cu_handle in loader.iter_cus():
-                raw_funcs = index_functions(
-                    cu_handle.cu, cu_handle.cu_offset, loader.dwarf
-                )
-
-                # Build the CU line table once and share it across all
-                # functions in this CU.  Avoids replaying the DWARF line
-                # state machine N times (once per function).
-                cu_line_table = build_cu_line_table(
-                    cu_handle.cu, loader.dwarf
-                )
-
-                for fe in raw_funcs:
-                    # compute line span
-                    span = compute_line_span(
-                        cu_handle.cu,
-                        loader.dwarf,
-                        cu_handle.comp_dir,
-                        fe.ranges,
-                        line_table=cu_line_table,
-                    )
-
-                    # apply policy
-                    fv, freasons = judge_function(fe, span, profile)
-
-                    # Build line_rows for ACCEPT/WARN (v0.2).
-                    # REJECT functions have no ranges so line_rows stays empty.
-                    func_line_rows: list[LineRowEntry] = []
-                    func_file_row_counts: dict[str, int] = {}
-                    if fv in (Verdict.ACCEPT, Verdict.WARN):
-                        func_line_rows = sorted(
-                            [
-                                LineRowEntry(file=f, line=l, count=c)
-                                for (f, l), c in span.line_rows.items()
-                            ],
-                            key=lambda r: (r.file, r.line),
-                        )
-                        func_file_row_counts = dict(
-                            sorted(span.file_row_counts.items())
-                        )
-
-                    # Resolve decl_file from index (v0.3)
-                    resolved_decl_file = None
-                    decl_missing_reason = None
-                    if fe.decl_file_index is not None:
-                        resolved_decl_file = resolve_file_index(
-                            fe.decl_file_index,
-                            cu_handle.cu,
-                            loader.dwarf,
-                            cu_handle.comp_dir,
-                        )
-                        if resolved_decl_file is None:
-                            decl_missing_reason = "FILE_INDEX_UNRESOLVABLE"
-                    else:
-                        decl_missing_reason = "NO_DECL_FILE_ATTR"
-
-                    cu_id = f"cu{cu_handle.cu_offset:#x}"
-
-                    entry = OracleFunctionEntry(
-                        function_id=fe.function_id,
-                        die_offset=hex(fe.die_offset),
-                        cu_offset=hex(fe.cu_offset),
-                        name=fe.name,
-                        linkage_name=fe.linkage_name,
-                        decl_file=resolved_decl_file,
-                        decl_line=fe.decl_line,
-                        decl_column=fe.decl_column,
-                        comp_dir=cu_handle.comp_dir,
-                        cu_id=cu_id,
-                        decl_missing_reason=decl_missing_reason,
-                        ranges=[
-                            RangeModel(low=hex(r.low), high=hex(r.high))
-                            for r in fe.ranges
-                        ],
-                        dominant_file=span.dominant_file,
-                        dominant_file_ratio=span.dominant_file_ratio,
-                        line_min=span.line_min,
-                        line_max=span.line_max,
-                        n_line_rows=span.n_line_rows,
-                        line_rows=func_line_rows,
-                        file_row_counts=func_file_row_counts,
-                        verdict=fv.value,
-                        reasons=freasons,
-                    )
-                    func_entries.append(entry)
-
-                    counts.total += 1
-                    if fv == Verdict.ACCEPT:
-                        counts.accept += 1
-                    elif fv == Verdict.WARN:
-                        counts.warn += 1
-                    else:
-                        counts.reject += 1
+            per_cu = loader.map_cus(partial(_process_cu, profile=profile), workers)
+        func_entries = [entry for entries in per_cu for entry in entries]
 
     except Exception as e:
         logger.error("DWARF parse error on %s: %s", binary_path, e, exc_info=True)
@@ -224,6 +235,16 @@ def run_oracle(
         return report, functions
 
     # ── Step 4: assemble outputs ─────────────────────────────────────
+    counts = FunctionCounts()
+    for entry in func_entries:
+        counts.total += 1
+        if entry.verdict == Verdict.ACCEPT.value:
+            counts.accept += 1
+        elif entry.verdict == Verdict.WARN.value:
+            counts.warn += 1
+        else:
+            counts.reject += 1
+
     # Binary-level verdict is ACCEPT if gate passed; aggregate function
     # verdicts don't change the binary verdict (they're per-function).
     report = OracleReport(
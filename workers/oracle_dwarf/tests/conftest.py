@@ -9,17 +9,37 @@ Requirements:
   - gcc must produce ELF binaries (Linux/WSL), not PE executables (native Windows)
 
 Tests are automatically skipped on Windows. Use WSL or Docker instead.
+
+Compiled binaries are cached in pytest's cache directory
+(``.pytest_cache/d/oracle_fixtures``), keyed by name, sources, flags and
+the ``gcc``/``strip`` versions, so re-runs copy them instead of
+recompiling.  DWARF paths are made relative to the build directory, so a
+cached binary is byte-identical to a fresh compile.  ``pytest
+--cache-clear`` forces a rebuild; ``-p no:cacheprovider`` disables the
+cache.  Binaries in ``_ABSOLUTE_COMP_DIR`` keep their absolute
+DW_AT_comp_dir, as production builds do, and are always compiled fresh.
+
+The fixtures are safe under pytest-xdist (``pytest -n auto``): every
+worker gets its own ``tmp_path_factory`` directory, and cache entries
+are published with an atomic ``os.replace`` of a per-process temp file,
+so workers racing on one key just write identical bytes.
 """
 import hashlib
+import os
 import platform
 import shutil
 import subprocess
 import tempfile
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import pytest
 
+# Sources are kept as UTF-8 bytes: _compile writes and hashes them as-is.
+
 # Minimal C source that compiles to a small binary with a few functions.
 MINIMAL_C = textwrap.dedent("""\
     #include <stdio.h>
@@ -39,7 +59,7 @@ MINIMAL_C = textwrap.dedent("""\
         printf("sum=%d prod=%d\\n", sum, prod);
         return 0;
     }
-""")
+""").encode()
 
 # Source with a single function (simplest possible case)
 SINGLE_FUNC_C = textwrap.dedent("""\
@@ -50,7 +70,7 @@ SINGLE_FUNC_C = textwrap.dedent("""\
     int main(void) {
         return square(5);
     }
-""")
+""").encode()
 
 
 # Multi-function source designed to exercise higher optimization levels.
@@ -97,7 +117,41 @@ MULTI_FUNC_C = textwrap.dedent("""\
         printf("result=%d\\n", s);
         return 0;
     }
-""")
+""").encode()
+
+# Second translation unit linked next to MINIMAL_C, giving a binary with
+# more than one compilation unit.
+SECOND_TU_C = textwrap.dedent("""\
+    static int negate(int x) {
+        return -x;
+    }
+
+    int absolute(int x) {
+        return x < 0 ? negate(x) : x;
+    }
+""").encode()
+
+
+# gcc flags shared by every fixture compile (besides -O<opt>).  ``-pipe``
+# hands cc1's assembly to ``as`` through a pipe instead of temp files.
+_CFLAGS = ("-g", "-pipe", "-std=c11", "-fno-omit-frame-pointer")
+
+# gcc only appends ``.exe`` to outputs on Windows hosts.
+IS_WINDOWS = platform.system() == "Windows"
+
+def _run(cmd: list, timeout: float, cwd: Optional[Path] = None) -> None:
+    """Run *cmd*, discarding stdout; stderr is kept only for the error.
+
+    Raises ``subprocess.CalledProcessError`` (with ``stderr``) on failure.
+    """
+    proc = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        timeout=timeout, cwd=cwd,
+    )
+    if proc.returncode:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, stderr=proc.stderr
+        )
 
 
 def _gcc_available() -> bool:
@@ -105,77 +159,166 @@ def _gcc_available() -> bool:
     return shutil.which("gcc") is not None
 
 
+@lru_cache(maxsize=None)
 def _gcc_produces_elf() -> bool:
     """Test if gcc produces ELF binaries (Linux/WSL) vs PE executables (Windows).
-    
+
     Returns False on native Windows where MSYS2/MinGW gcc produces PE format.
+    Decided from the ``gcc -dumpmachine`` target triple; only a triple
+    that names neither kind falls back to compiling a probe program.
     """
     if not _gcc_available():
         return False
-    
-    # Quick platform check - native Windows cannot produce ELF
-    if platform.system() == "Windows":
-        # Could be WSL - test by compiling
-        pass
-    
-    # Compile a minimal test program
+
+    try:
+        triple = subprocess.run(
+            ["gcc", "-dumpmachine"], capture_output=True, text=True, timeout=5
+        ).stdout.lower()
+    except Exception:
+        triple = ""
+    if any(t in triple for t in ("mingw", "cygwin", "msys", "msvc", "windows")):
+        return False
+    if "linux" in triple or "elf" in triple:
+        return True
+    return _probe_compile_is_elf()
+
+
+def _probe_compile_is_elf() -> bool:
+    """Compile a minimal program and check the output's magic bytes."""
     with tempfile.TemporaryDirectory() as tmpdir:
         test_c = Path(tmpdir) / "test.c"
         test_out = Path(tmpdir) / "test_out"
-        test_c.write_text("int main() { return 0; }")
-        
+        test_c.write_bytes(b"int main() { return 0; }")
+
         try:
-            subprocess.run(
-                ["gcc", str(test_c), "-o", str(test_out)],
-                check=True,
-                capture_output=True,
-                timeout=10
-            )
-            
+            _run(["gcc", "-pipe", str(test_c), "-o", str(test_out)], timeout=10)
+
             # Check both with and without .exe extension
             if test_out.exists():
                 binary = test_out
-            elif test_out.with_suffix(".exe").exists():
+            elif IS_WINDOWS and test_out.with_suffix(".exe").exists():
                 binary = test_out.with_suffix(".exe")
             else:
                 return False
-            
+
             # Check magic bytes: ELF = 0x7F 'E' 'L' 'F', PE = 'M' 'Z'
             magic = binary.read_bytes()[:4]
             return magic[:4] == b'\x7fELF'
-            
+
         except Exception:
             return False
 
 
-def _compile(source: str, output: Path, opt: str = "O0", strip: bool = False) -> Path:
+@lru_cache(maxsize=None)
+def _tool_version(tool: str) -> str:
+    """``<tool> --version`` output (gcc, strip), part of the cache key."""
+    proc = subprocess.run(
+        [tool, "--version"], capture_output=True, text=True, timeout=10
+    )
+    return proc.stdout
+
+
+def _cache_key(
+    name: str,
+    source: bytes,
+    opt: str,
+    strip: bool,
+    extra_sources: Tuple[bytes, ...],
+) -> str:
+    """SHA-256 over everything that determines the compiled binary.
+
+    *name* is included because the source file names derived from it
+    end up in the DWARF (DW_AT_name, line-table file entries).
+    """
+    flags = " ".join(_CFLAGS)
+    strip_version = _tool_version("strip") if strip else ""
+    h = hashlib.sha256(
+        f"{name}|{opt}|{flags}|{strip}|{_tool_version('gcc')}|{strip_version}|"
+        .encode()
+    )
+    for src in (source, *extra_sources):
+        h.update(hashlib.sha256(src).digest())
+    return h.hexdigest()
+
+
+def _compile(
+    source: bytes,
+    output: Path,
+    opt: str = "O0",
+    strip: bool = False,
+    extra_sources: Tuple[bytes, ...] = (),
+    *,
+    prefix_map: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Path:
     """Compile C source to an ELF binary with gcc.
-    
+
+    Each of *extra_sources* is compiled as its own translation unit and
+    linked in, adding one CU per source.
+
+    gcc runs inside ``output.parent`` on relative source names.  With
+    *prefix_map*, ``-fdebug-prefix-map`` rewrites that directory to
+    ``.``, so the DWARF paths (DW_AT_comp_dir, file tables) do not depend
+    on the per-session temp directory.  Such a binary is byte-identical
+    whether it was compiled now or reused from *cache_dir*, which it is
+    when the same name, sources, flags and tool versions were compiled
+    before.  Without *prefix_map* the comp_dir stays absolute and the
+    cache is bypassed.
+
     Returns the actual path to the compiled binary.
     """
+    cached = None
+    if prefix_map and cache_dir is not None:
+        cached = cache_dir / _cache_key(
+            output.name, source, opt, strip, extra_sources
+        )
+        if cached.is_file():
+            shutil.copy(cached, output)
+            return output
+
     src_file = output.with_suffix(".c")
-    src_file.write_text(source)
+    src_file.write_bytes(source)
+    src_files = [src_file]
+    for i, extra in enumerate(extra_sources, start=1):
+        extra_file = output.with_name(f"{output.name}_{i}.c")
+        extra_file.write_bytes(extra)
+        src_files.append(extra_file)
     cmd = [
         "gcc",
         f"-{opt}",
-        "-g", "-g3",
-        "-std=c11",
-        "-fno-omit-frame-pointer",
-        str(src_file),
-        "-o", str(output),
+        *_CFLAGS,
+        *([f"-fdebug-prefix-map={output.parent}=."] if prefix_map else []),
+        *(f.name for f in src_files),
+        "-o", output.name,
     ]
-    subprocess.run(cmd, check=True, capture_output=True, timeout=30)
+    _run(cmd, timeout=30, cwd=output.parent)
     
     # Handle potential .exe extension on Windows
-    if not output.exists() and output.with_suffix(".exe").exists():
+    if IS_WINDOWS and not output.exists() and output.with_suffix(".exe").exists():
         output = output.with_suffix(".exe")
     
     if strip:
-        subprocess.run(["strip", "--strip-all", str(output)], check=True, timeout=10)
-    
+        _run(["strip", "--strip-all", str(output)], timeout=10)
+
+    if cached is not None:
+        try:
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            shutil.copy(output, tmp)
+            os.replace(tmp, cached)   # atomic: readers never see a partial file
+        except OSError:
+            pass                      # read-only checkout — caching is optional
+
     return output
 
 
+# Native Windows gcc (MinGW/MSYS2) cannot build the ELF fixtures: ignore
+# the test modules outright so pytest does not import the oracle and
+# collect tests that would all skip.  Elsewhere gcc_ok skips per test.
+collect_ignore_glob = (
+    ["test_*.py"] if IS_WINDOWS and not _gcc_produces_elf() else []
+)
+
+
 @pytest.fixture(scope="session")
 def gcc_ok():
     """Skip tests if gcc is not available or doesn't produce ELF binaries.
@@ -202,34 +345,116 @@ def fixtures_dir(tmp_path_factory, gcc_ok) -> Path:
     return d
 
 
+# Every session binary: name -> (source, opt, strip, extra_sources).
+_BINARIES = {
+    "minimal_O0": (MINIMAL_C, "O0", False, ()),
+    "minimal_O1": (MINIMAL_C, "O1", False, ()),
+    "minimal_stripped": (MINIMAL_C, "O0", True, ()),
+    "single_func": (SINGLE_FUNC_C, "O0", False, ()),
+    "multi_cu": (MINIMAL_C, "O0", False, (SECOND_TU_C,)),
+    "multi_O0": (MULTI_FUNC_C, "O0", False, ()),
+    "multi_O2": (MULTI_FUNC_C, "O2", False, ()),
+    "multi_O3": (MULTI_FUNC_C, "O3", False, ()),
+}
+
+# Built without -fdebug-prefix-map: their DW_AT_comp_dir is the absolute
+# build directory, so path resolution against comp_dir is exercised.
+_ABSOLUTE_COMP_DIR = frozenset({"minimal_O0"})
+
+
+@pytest.fixture(scope="session")
+def _binary_cache_dir(pytestconfig) -> Optional[Path]:
+    """pytest's cache directory for compiled binaries (None if disabled)."""
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is None:
+        return None
+    try:
+        return cache.mkdir("oracle_fixtures")
+    except OSError:
+        return None
+
+
 @pytest.fixture(scope="session")
-def debug_binary_O0(fixtures_dir) -> Path:
-    """Minimal C program compiled at -O0 with full debug info."""
-    return _compile(MINIMAL_C, fixtures_dir / "minimal_O0", opt="O0")
+def _all_binaries(fixtures_dir, _binary_cache_dir) -> Dict[str, Path]:
+    """Compile every entry of ``_BINARIES`` concurrently, keyed by name.
+
+    Each gcc run is its own process, so a thread pool overlaps them and
+    session warm-up costs the slowest compile rather than the sum.
+    """
+    def build(name: str) -> Path:
+        source, opt, strip, extra = _BINARIES[name]
+        return _compile(
+            source, fixtures_dir / name, opt=opt, strip=strip,
+            extra_sources=extra, prefix_map=name not in _ABSOLUTE_COMP_DIR,
+            cache_dir=_binary_cache_dir,
+        )
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return dict(zip(_BINARIES, pool.map(build, _BINARIES)))
 
 
 @pytest.fixture(scope="session")
-def debug_binary_O1(fixtures_dir) -> Path:
+def debug_binary_O0(_all_binaries) -> Path:
+    """Minimal C program compiled at -O0 with full debug info.
+
+    Built without the prefix map: DW_AT_comp_dir is its absolute build
+    directory.
+    """
+    return _all_binaries["minimal_O0"]
+
+
+@pytest.fixture(scope="session")
+def debug_binary_O1(_all_binaries) -> Path:
     """Minimal C program compiled at -O1 with full debug info."""
-    return _compile(MINIMAL_C, fixtures_dir / "minimal_O1", opt="O1")
+    return _all_binaries["minimal_O1"]
 
 
 @pytest.fixture(scope="session")
-def stripped_binary(fixtures_dir) -> Path:
+def stripped_binary(_all_binaries) -> Path:
     """Minimal C program compiled and stripped (no debug info)."""
-    return _compile(MINIMAL_C, fixtures_dir / "minimal_stripped", opt="O0", strip=True)
+    return _all_binaries["minimal_stripped"]
 
 
 @pytest.fixture(scope="session")
-def single_func_binary(fixtures_dir) -> Path:
+def single_func_binary(_all_binaries) -> Path:
     """Two-function program compiled at -O0 with debug info."""
-    return _compile(SINGLE_FUNC_C, fixtures_dir / "single_func", opt="O0")
+    return _all_binaries["single_func"]
+
+
+@pytest.fixture(scope="session")
+def multi_cu_binary(_all_binaries) -> Path:
+    """MINIMAL_C linked with SECOND_TU_C: two compilation units."""
+    return _all_binaries["multi_cu"]
 
 
-@pytest.fixture
-def not_elf(tmp_path) -> Path:
-    """A file that is not an ELF binary."""
-    p = tmp_path / "not_an_elf"
+@pytest.fixture(scope="session")
+def oracle_result_O0(debug_binary_O0):
+    """``run_oracle(debug_binary_O0)`` computed once per session.
+
+    Tests must treat the returned ``(report, functions)`` as read-only.
+    """
+    from oracle_dwarf.runner import run_oracle
+    return run_oracle(str(debug_binary_O0))
+
+
+@pytest.fixture(scope="session")
+def func_names_O0(oracle_result_O0) -> frozenset:
+    """Names of all named functions in ``oracle_result_O0``."""
+    _, functions = oracle_result_O0
+    return frozenset(f.name for f in functions.functions if f.name)
+
+
+@pytest.fixture(scope="session")
+def elf_meta_O0(debug_binary_O0):
+    """``read_elf(debug_binary_O0)`` computed (and hashed) once per session."""
+    from oracle_dwarf.core.elf_reader import read_elf
+    return read_elf(str(debug_binary_O0))
+
+
+@pytest.fixture(scope="session")
+def not_elf(tmp_path_factory) -> Path:
+    """A file that is not an ELF binary (read-only, shared by the session)."""
+    p = tmp_path_factory.mktemp("not_elf_dir") / "not_an_elf"
     p.write_bytes(b"This is not an ELF file.\x00\x00\x00")
     return p
 
@@ -237,18 +462,18 @@ def not_elf(tmp_path) -> Path:
 # ── O2 / O3 fixtures (MULTI_FUNC_C) ─────────────────────────────────
 
 @pytest.fixture(scope="session")
-def multi_func_binary_O0(fixtures_dir) -> Path:
+def multi_func_binary_O0(_all_binaries) -> Path:
     """Multi-function C program compiled at -O0 (baseline for O2/O3 comparison)."""
-    return _compile(MULTI_FUNC_C, fixtures_dir / "multi_O0", opt="O0")
+    return _all_binaries["multi_O0"]
 
 
 @pytest.fixture(scope="session")
-def multi_func_binary_O2(fixtures_dir) -> Path:
+def multi_func_binary_O2(_all_binaries) -> Path:
     """Multi-function C program compiled at -O2 with debug info."""
-    return _compile(MULTI_FUNC_C, fixtures_dir / "multi_O2", opt="O2")
+    return _all_binaries["multi_O2"]
 
 
 @pytest.fixture(scope="session")
-def multi_func_binary_O3(fixtures_dir) -> Path:
+def multi_func_binary_O3(_all_binaries) -> Path:
     """Multi-function C program compiled at -O3 with debug info."""
-    return _compile(MULTI_FUNC_C, fixtures_dir / "multi_O3", opt="O3")
+    return _all_binaries["multi_O3"]
@@ -14,22 +14,21 @@ from oracle_dwarf.policy.verdict import Verdict
 class TestFunctionIndex:
     """Function enumeration invariants."""
 
-    def test_user_functions_present(self, debug_binary_O0):
+    def test_user_functions_present(self, oracle_result_O0, func_names_O0):
         """User-defined functions from MINIMAL_C must appear in the index."""
-        report, functions = run_oracle(str(debug_binary_O0))
+        report, _ = oracle_result_O0
 
         assert report.verdict == "ACCEPT"
-        names = {f.name for f in functions.functions if f.name is not None}
 
         # The source defines: add, multiply, main
-        assert "add" in names
-        assert "multiply" in names
-        assert "main" in names
+        assert "add" in func_names_O0
+        assert "multiply" in func_names_O0
+        assert "main" in func_names_O0
 
-    def test_accept_functions_have_valid_ranges(self, debug_binary_O0):
+    def test_accept_functions_have_valid_ranges(self, oracle_result_O0):
         """Every ACCEPT function must have at least one [low, high) range
         where low < high."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         accepted = [f for f in functions.functions if f.verdict == "ACCEPT"]
         assert len(accepted) > 0, "Expected at least one ACCEPT function"
@@ -45,18 +44,18 @@ class TestFunctionIndex:
                     f"Invalid range for {func.name}: [{r.low}, {r.high})"
                 )
 
-    def test_accept_functions_have_function_id(self, debug_binary_O0):
+    def test_accept_functions_have_function_id(self, oracle_result_O0):
         """Every function entry must have a stable, non-empty function_id."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             assert func.function_id
             assert "cu" in func.function_id
             assert "die" in func.function_id
 
-    def test_declaration_only_rejected(self, debug_binary_O0):
+    def test_declaration_only_rejected(self, oracle_result_O0):
         """Declaration-only DIEs (if any) must be REJECT DECLARATION_ONLY."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         decl_only = [
             f for f in functions.functions
@@ -65,9 +64,9 @@ class TestFunctionIndex:
         for f in decl_only:
             assert f.verdict == "REJECT"
 
-    def test_no_duplicate_function_ids(self, debug_binary_O0):
+    def test_no_duplicate_function_ids(self, oracle_result_O0):
         """Function IDs must be unique within a binary."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         ids = [f.function_id for f in functions.functions]
         assert len(ids) == len(set(ids)), "Duplicate function_id detected"
@@ -88,3 +87,29 @@ class TestFunctionIndex:
         names = {f.name for f in functions.functions if f.name is not None}
         assert "square" in names
         assert "main" in names
+
+    def test_unparsable_range_lists_only_empty_ranges(self, multi_func_binary_O2):
+        """A range-list section pyelftools cannot parse must not fail the
+        CU: only DW_AT_ranges subprograms lose their ranges."""
+        from oracle_dwarf.core.dwarf_loader import DwarfLoader
+        from oracle_dwarf.core.function_index import index_functions
+
+        def broken():
+            raise ValueError("bad .debug_rnglists")
+
+        with DwarfLoader(str(multi_func_binary_O2)) as loader:
+            dwarf = loader.dwarf
+            expected = [
+                index_functions(h.cu, h.cu_offset, dwarf) for h in loader.iter_cus()
+            ]
+            dwarf.range_lists = broken
+            got = [
+                index_functions(h.cu, h.cu_offset, dwarf) for h in loader.iter_cus()
+            ]
+
+        assert [[f.function_id for f in cu] for cu in got] == [
+            [f.function_id for f in cu] for cu in expected
+        ]
+        for cu_got, cu_exp in zip(got, expected):
+            for g, e in zip(cu_got, cu_exp):
+                assert g.ranges in (e.ranges, [])
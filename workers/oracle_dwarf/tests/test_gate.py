@@ -5,7 +5,16 @@ Tests verify invariant properties:
   - A debug binary with .debug_info + .debug_line → ACCEPT at binary gate.
   - A stripped binary → REJECT with NO_DEBUG_INFO reason.
   - A non-ELF file → REJECT with DWARF_PARSE_ERROR.
+  - file_sha256 / file_size describe the bytes on disk; a parse failure
+    stops the background hash.
 """
+import hashlib
+import os
+
+import pytest
+from elftools.common.exceptions import ELFError
+
+from oracle_dwarf.core import elf_reader
 from oracle_dwarf.core.elf_reader import read_elf
 from oracle_dwarf.policy.profile import Profile
 from oracle_dwarf.policy.verdict import Verdict, gate_binary, BinaryRejectReason
@@ -15,9 +24,9 @@ from oracle_dwarf.runner import run_oracle
 class TestBinaryGate:
     """Binary-level gate tests."""
 
-    def test_debug_binary_accepted(self, debug_binary_O0):
+    def test_debug_binary_accepted(self, elf_meta_O0):
         """A debug-variant binary must pass the binary gate."""
-        meta = read_elf(str(debug_binary_O0))
+        meta = elf_meta_O0
         profile = Profile.v0()
         verdict, reasons = gate_binary(meta, profile)
 
@@ -43,9 +52,9 @@ class TestBinaryGate:
         assert BinaryRejectReason.DWARF_PARSE_ERROR.value in report.reasons
         assert functions.functions == []
 
-    def test_elf_meta_fields(self, debug_binary_O0):
+    def test_elf_meta_fields(self, elf_meta_O0):
         """ElfMeta must have consistent structural fields."""
-        meta = read_elf(str(debug_binary_O0))
+        meta = elf_meta_O0
 
         assert meta.machine == "EM_X86_64"
         assert meta.elf_class == 64
@@ -61,3 +70,30 @@ class TestBinaryGate:
         assert report.verdict == "REJECT"
         assert report.function_counts.total == 0
         assert len(functions.functions) == 0
+
+    def test_elf_meta_hash_matches_file(self, debug_binary_O0):
+        """file_sha256 and file_size match the binary's bytes."""
+        data = debug_binary_O0.read_bytes()
+        meta = read_elf(str(debug_binary_O0))
+
+        assert meta.file_sha256 == hashlib.sha256(data).hexdigest()
+        assert meta.file_size == len(data)
+
+    @pytest.mark.skipif(not hasattr(os, "pread"), reason="hash runs inline")
+    def test_parse_error_cancels_hash(self, tmp_path, monkeypatch):
+        """A non-ELF file raises without hashing the rest of the file."""
+        results = []
+        real_hash = elf_reader._sha256_fd
+
+        def recording_hash(*args):
+            results.append(real_hash(*args))
+            return results[-1]
+
+        monkeypatch.setattr(elf_reader, "_sha256_fd", recording_hash)
+        big = tmp_path / "big.bin"
+        with open(big, "wb") as f:
+            f.truncate(1 << 30)  # sparse: ~1 s to hash in full
+
+        with pytest.raises(ELFError):
+            read_elf(str(big))
+        assert results == [None]
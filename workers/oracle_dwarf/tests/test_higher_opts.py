@@ -14,7 +14,12 @@ Fixtures:
 import pytest
 
 from oracle_dwarf.core.function_index import AddressRange, _merge_ranges
-from oracle_dwarf.core.line_mapper import build_cu_line_table, compute_line_span
+from oracle_dwarf.core.line_mapper import (
+    build_cu_line_table,
+    build_file_table,
+    build_row_index,
+    compute_line_span,
+)
 from oracle_dwarf.core.dwarf_loader import DwarfLoader
 from oracle_dwarf.core.function_index import index_functions
 from oracle_dwarf.runner import run_oracle
@@ -88,7 +93,7 @@ class TestOverlapSafety:
         """Create synthetic overlapping ranges from a real function's
         range and verify n_line_rows is unchanged.
 
-        This test would fail if _in_ranges double-counted addresses
+        This test would fail if the range check double-counted addresses
         that fall inside multiple overlapping range segments.
         """
         with DwarfLoader(str(debug_binary_O0)) as loader:
@@ -132,7 +137,7 @@ class TestOverlapSafety:
                     overlapping, line_table=cu_line_table,
                 )
 
-                # _in_ranges is boolean per-row, so n_line_rows must
+                # The range check is boolean per-row, so n_line_rows must
                 # be the same regardless of range decomposition.
                 assert span_overlap.n_line_rows == span_single.n_line_rows, (
                     f"Overlap inflated n_line_rows: "
@@ -264,6 +269,33 @@ class TestHigherOptLineSpan:
                 assert keys == sorted(keys)
 
 
+    def test_cu_caches_match_full_scan_at_o3(self, multi_func_binary_O3):
+        """Clipping rows through a RowIndex and resolving paths through
+        the CU file table must not change any span."""
+        checked = 0
+        with DwarfLoader(str(multi_func_binary_O3)) as loader:
+            for cu_handle in loader.iter_cus():
+                cu_line_table = build_cu_line_table(cu_handle.cu, loader.dwarf)
+                if not cu_line_table:
+                    continue
+                row_index = build_row_index(cu_line_table)
+                file_table = build_file_table(
+                    cu_handle.cu, loader.dwarf, cu_handle.comp_dir
+                )
+                for fe in index_functions(
+                    cu_handle.cu, cu_handle.cu_offset, loader.dwarf
+                ):
+                    args = (cu_handle.cu, loader.dwarf, cu_handle.comp_dir, fe.ranges)
+                    full = compute_line_span(*args, line_table=cu_line_table)
+                    clipped = compute_line_span(
+                        *args, line_table=cu_line_table, row_index=row_index,
+                        file_table=file_table,
+                    )
+                    assert clipped == full, fe.function_id
+                    checked += not full.is_empty
+        assert checked > 0
+
+
 class TestHigherOptComparisons:
     """Cross-optimization comparisons."""
 
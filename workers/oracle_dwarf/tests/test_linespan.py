@@ -6,16 +6,19 @@ Tests verify invariant properties:
   - line_min <= line_max for every function with a line span.
   - dominant_file_ratio is in (0, 1] for functions with line rows.
   - dominant_file is set for every ACCEPT function.
+  - Relative file names are resolved against an absolute comp_dir.
 """
+from pathlib import Path
+
 from oracle_dwarf.runner import run_oracle
 
 
 class TestLineSpan:
     """Line span invariants."""
 
-    def test_accept_functions_have_line_rows(self, debug_binary_O0):
+    def test_accept_functions_have_line_rows(self, oracle_result_O0):
         """Every ACCEPT function must have at least one line row."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         accepted = [f for f in functions.functions if f.verdict == "ACCEPT"]
         assert len(accepted) > 0
@@ -25,9 +28,9 @@ class TestLineSpan:
                 f"ACCEPT function {func.name!r} has 0 line rows"
             )
 
-    def test_line_min_le_line_max(self, debug_binary_O0):
+    def test_line_min_le_line_max(self, oracle_result_O0):
         """line_min must be <= line_max when both are set."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             if func.line_min is not None and func.line_max is not None:
@@ -35,9 +38,9 @@ class TestLineSpan:
                     f"{func.name}: line_min={func.line_min} > line_max={func.line_max}"
                 )
 
-    def test_dominant_file_ratio_range(self, debug_binary_O0):
+    def test_dominant_file_ratio_range(self, oracle_result_O0):
         """dominant_file_ratio must be in (0.0, 1.0] when rows exist."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             if func.n_line_rows > 0:
@@ -45,9 +48,9 @@ class TestLineSpan:
                     f"{func.name}: bad ratio {func.dominant_file_ratio}"
                 )
 
-    def test_dominant_file_set_for_accept(self, debug_binary_O0):
+    def test_dominant_file_set_for_accept(self, oracle_result_O0):
         """ACCEPT functions must have dominant_file set."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         accepted = [f for f in functions.functions if f.verdict == "ACCEPT"]
         for func in accepted:
@@ -55,10 +58,26 @@ class TestLineSpan:
                 f"ACCEPT function {func.name!r} has no dominant_file"
             )
 
-    def test_single_file_dominant(self, debug_binary_O0):
+    def test_files_resolved_against_comp_dir(self, oracle_result_O0, debug_binary_O0):
+        """gcc records the source by relative name; decl_file and
+        dominant_file are joined onto the absolute build directory."""
+        _, functions = oracle_result_O0
+        source = debug_binary_O0.with_suffix(".c").resolve()
+
+        user_funcs = [
+            f for f in functions.functions
+            if f.name in ("add", "multiply", "main") and f.verdict == "ACCEPT"
+        ]
+        assert user_funcs
+        for func in user_funcs:
+            for path in (func.decl_file, func.dominant_file):
+                assert Path(path).is_absolute(), f"{func.name}: {path}"
+                assert Path(path).resolve() == source
+
+    def test_single_file_dominant(self, oracle_result_O0):
         """For a single-file program, dominant_file_ratio should be 1.0
         for user-defined functions."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         user_funcs = [
             f for f in functions.functions
@@ -70,9 +89,9 @@ class TestLineSpan:
                 f"{func.name}: expected ratio 1.0, got {func.dominant_file_ratio}"
             )
 
-    def test_output_schema_contract(self, debug_binary_O0):
+    def test_output_schema_contract(self, oracle_result_O0):
         """Verify runtime contract fields are present in the report."""
-        report, functions = run_oracle(str(debug_binary_O0))
+        report, functions = oracle_result_O0
 
         # Report contract
         assert report.package_name == "oracle_dwarf"
@@ -90,9 +109,9 @@ class TestLineSpan:
 
     # ── v0.2 line_rows tests ─────────────────────────────────────────
 
-    def test_line_rows_populated_for_accept(self, debug_binary_O0):
+    def test_line_rows_populated_for_accept(self, oracle_result_O0):
         """ACCEPT functions must have non-empty line_rows list."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         accepted = [f for f in functions.functions if f.verdict == "ACCEPT"]
         assert len(accepted) > 0
@@ -102,9 +121,9 @@ class TestLineSpan:
                 f"ACCEPT function {func.name!r} has empty line_rows"
             )
 
-    def test_line_rows_empty_for_reject(self, debug_binary_O0):
+    def test_line_rows_empty_for_reject(self, oracle_result_O0):
         """REJECT functions must have empty line_rows."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         rejected = [f for f in functions.functions if f.verdict == "REJECT"]
         for func in rejected:
@@ -112,9 +131,9 @@ class TestLineSpan:
                 f"REJECT function {func.name!r} should have empty line_rows"
             )
 
-    def test_line_rows_count_sum_equals_n_line_rows(self, debug_binary_O0):
+    def test_line_rows_count_sum_equals_n_line_rows(self, oracle_result_O0):
         """sum(row.count) must equal n_line_rows for every function."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             row_sum = sum(r.count for r in func.line_rows)
@@ -126,9 +145,9 @@ class TestLineSpan:
                     f"!= n_line_rows={func.n_line_rows}"
                 )
 
-    def test_file_row_counts_consistent(self, debug_binary_O0):
+    def test_file_row_counts_consistent(self, oracle_result_O0):
         """file_row_counts must match aggregated line_rows by file."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             if func.verdict == "REJECT":
@@ -144,9 +163,9 @@ class TestLineSpan:
                 f"{func.name}: file_row_counts mismatch"
             )
 
-    def test_line_rows_sorted_deterministically(self, debug_binary_O0):
+    def test_line_rows_sorted_deterministically(self, oracle_result_O0):
         """line_rows must be sorted by (file, line) for reproducibility."""
-        _, functions = run_oracle(str(debug_binary_O0))
+        _, functions = oracle_result_O0
 
         for func in functions.functions:
             if len(func.line_rows) < 2:
@@ -180,3 +199,17 @@ class TestLineSpan:
             assert len(fa.line_rows) == len(fb.line_rows)
             for ra, rb in zip(fa.line_rows, fb.line_rows):
                 assert (ra.file, ra.line, ra.count) == (rb.file, rb.line, rb.count)
+
+
+class TestParallelCUs:
+    """Per-CU processing across worker processes."""
+
+    def test_worker_pool_matches_in_process(self, multi_cu_binary, monkeypatch):
+        from oracle_dwarf.core import dwarf_loader
+
+        path = str(multi_cu_binary)
+        _, expected = run_oracle(path)
+        monkeypatch.setattr(dwarf_loader, "PARALLEL_MIN_CUS", 1)
+        _, pooled = run_oracle(path, workers=2)
+        assert pooled.functions == expected.functions
+        assert len({e.cu_id for e in expected.functions}) == 2
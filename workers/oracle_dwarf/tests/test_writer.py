@@ -0,0 +1,44 @@
+"""
+test_writer — JSON output files.
+
+Tests verify invariant properties:
+  - The orjson and stdlib json paths write byte-identical files,
+    including for non-ASCII paths.
+"""
+import pytest
+
+from oracle_dwarf.io import writer
+from oracle_dwarf.io.schema import OracleFunctionsOutput, OracleReport
+
+
+def _outputs():
+    path = "/tmp/bäume/проба.bin"
+    report = OracleReport(
+        profile_id="p",
+        binary_path=path,
+        binary_sha256="",
+        verdict="ACCEPT",
+        reasons=[],
+    )
+    functions = OracleFunctionsOutput(
+        profile_id="p",
+        binary_path=path,
+        binary_sha256="",
+    )
+    return report, functions
+
+
+class TestWriteOutputs:
+    """Output bytes do not depend on the optional orjson package."""
+
+    def test_orjson_and_json_paths_match(self, tmp_path, monkeypatch):
+        pytest.importorskip("orjson")
+        report, functions = _outputs()
+
+        fast = writer.write_outputs(report, functions, tmp_path / "orjson")
+        monkeypatch.setattr(writer, "orjson", None)
+        slow = writer.write_outputs(report, functions, tmp_path / "json")
+
+        for name in ("oracle_report.json", "oracle_functions.json"):
+            assert (fast / name).read_bytes() == (slow / name).read_bytes()
+        assert "bäume".encode() in (slow / "oracle_report.json").read_bytes()